@@ -1,6 +1,15 @@
 import logging
 from logging.handlers import RotatingFileHandler
-from flask import Flask, request, render_template, redirect, url_for, jsonify, send_from_directory
+from flask import Flask, request, render_template, redirect, url_for, jsonify, send_from_directory, Response, stream_with_context
+import uuid
+import gzip
+import base64
+import random
+import statistics
+import click
+import queue
+from collections import OrderedDict, defaultdict, deque
+from contextlib import contextmanager
 from googlesearch import search
 import mysql.connector
 from urllib.parse import urlparse
@@ -9,13 +18,14 @@ import requests
 from datetime import datetime, timedelta 
 import time
 import mimetypes
-import PyPDF2
 import io
+from pdf_extraction import extrage_text_pdf
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException
 import json 
 from diff_match_patch import diff_match_patch
 import threading
@@ -28,6 +38,20 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.date import DateTrigger
 import atexit
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import os
+import tempfile
+import functools
+import pathlib
+import http.server
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
 
 # Configurare Flask pentru servirea fișierelor statice
 app = Flask(__name__, static_folder='static')
@@ -47,6 +71,12 @@ except ImportError:
     logger.error("Could not import config.py. Please ensure the file exists and contains valid credentials.")
     sys.exit(1)
 
+try:
+    # Conturi Twitter suplimentare (opțional) pentru căutările rulate în paralel
+    from config import TWITTER_ACCOUNTS
+except ImportError:
+    TWITTER_ACCOUNTS = []
+
 # Configurare logging cu rotație și thread safety
 def setup_logging():
     """
@@ -125,6 +155,140 @@ RETRY_DELAY = 2
 MAX_LIFETIME = 3600  # 1 oră
 PING_INTERVAL = 300  # 5 minute
 
+# Configurări îmbogățire rezultate Google (modul deep)
+ENRICH_MAX_WORKERS = 8  # thread-uri pentru descărcarea paginilor
+ENRICH_PER_HOST_LIMIT = 2  # cereri simultane către același host
+ENRICH_DEADLINE = 8  # secunde pentru întregul lot de rezultate
+
+# Configurări client HTTP partajat pentru descărcarea paginilor
+HTTP_TIMEOUT = 5  # secunde
+HTTP_POOL_CONNECTIONS = 20  # numărul de host-uri păstrate în pool
+HTTP_POOL_SIZE = 10  # conexiuni keep-alive păstrate per host
+HTTP_MAX_RETRIES = 2
+HTTP_BACKOFF_FACTOR = 0.5  # pauză exponențială între reîncercări
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+DNS_CACHE_TTL = 300  # secunde
+DNS_CACHE_MAX_ENTRIES = 1024  # peste această limită se elimină host-urile cel mai puțin folosite
+HTTP_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Configurări cache persistent pentru metadatele paginilor
+URL_CACHE_TTL = 6 * 3600  # secunde în care intrarea e folosită fără revalidare
+URL_CACHE_MAX_ENTRIES = 50000  # peste această limită se elimină intrările cel mai puțin folosite
+
+# Configurări extragere HTML
+HTML_CHUNK_SIZE = 8192
+HTML_HEAD_MAX_BYTES = 256 * 1024  # buget pentru extragerea titlului/descrierii
+HTML_FULL_MAX_BYTES = 5 * 1024 * 1024  # buget pentru extragerea textului complet (opt-in)
+
+# Configurări extragere PDF
+PDF_WORKERS = 2  # procese pentru extragerea textului din PDF
+PDF_MAX_BYTES = 20 * 1024 * 1024  # PDF-urile mai mari sunt ignorate
+PDF_SPOOL_THRESHOLD = 1024 * 1024  # peste acest prag PDF-ul se scrie într-un fișier temporar
+PDF_MAX_PAGES = 50  # pagini extrase implicit
+PDF_TIMEOUT = 30  # secunde pentru extragerea unui singur PDF
+
+# Configurări cache pentru căutările Google
+GOOGLE_CACHE_TTL = 300  # secunde
+
+# Configurări limitare adaptivă a ratei pentru Google și Twitter (cereri/secundă)
+RATE_LIMITS = {
+    'google': {'rate': 0.5, 'min_rate': 0.05, 'max_rate': 1.0, 'burst': 2},
+    'twitter': {'rate': 0.2, 'min_rate': 0.02, 'max_rate': 0.5, 'burst': 2}
+}
+RATE_INCREASE_STEP = 0.02  # creștere aditivă după fiecare succes
+RATE_DECREASE_FACTOR = 0.5  # scădere multiplicativă după fiecare eroare
+
+# Configurări colectare Google paginată
+GOOGLE_PAGE_SIZE = 10  # rezultate pe pagină returnate de Google
+GOOGLE_STREAM_MAX_RESULTS = 500
+GOOGLE_STREAM_BATCH_SIZE = 20  # rezultate salvate per tranzacție
+GOOGLE_STREAM_PAGE_INTERVAL = 2  # secunde între cererile de pagină către Google
+
+# Configurări job-uri de căutare asincrone
+SEARCH_JOB_WORKERS = 4  # pipeline-uri de căutare rulate simultan
+SEARCH_JOB_RETENTION = 3600  # secunde în care job-urile terminate rămân disponibile
+SSE_KEEPALIVE = 15  # secunde între mesajele keep-alive pe fluxul SSE
+
+# Configurări pool de browsere Chrome pentru Twitter
+BROWSER_POOL_SIZE = 2  # instanțe Chrome păstrate pornite
+BROWSER_MAX_USES = 50  # după acest număr de căutări browser-ul este repornit
+BROWSER_MAX_HEAP_MB = 512  # prag de memorie JS peste care browser-ul este repornit (fără /proc)
+BROWSER_MAX_RSS_GROWTH_MB = 768  # creșterea RSS a proceselor Chrome față de pornire peste care browser-ul este repornit
+BROWSER_BORROW_TIMEOUT = 120  # secunde de așteptare pentru un browser liber
+
+# Configurări sesiune Twitter
+TWITTER_SESSION_FILE = 'twitter_session.json'  # cookie-urile sesiunii autentificate
+TWITTER_AUTH_COOKIE = 'auth_token'
+
+# Configurări așteptări adaptive în Selenium
+WAIT_POLL_INTERVAL = 0.1  # secunde între verificările condiției
+WAIT_MIN_TIMEOUT = 3
+WAIT_MAX_TIMEOUT = 15
+WAIT_TIMEOUT_MULTIPLIER = 3  # timeout adaptiv = p95 observat × multiplicator
+WAIT_SAMPLE_SIZE = 50  # durate păstrate per tip de așteptare
+WAIT_DOM_QUIET_MS = 500
+WAIT_NETWORK_QUIET_MS = 500
+
+# Configurări extragere tweet-uri
+TWITTER_MAX_TWEETS = 10  # tweet-uri procesate per căutare
+TWITTER_EXTRACTION_MODE = 'batch'  # 'batch' = un singur execute_script, 'elements' = find_element per câmp
+
+# Configurări colectare Twitter prin scroll continuu
+TWITTER_SCROLL_TARGET = 200  # tweet-uri colectate implicit
+TWITTER_SCROLL_TIME_BUDGET = 120  # secunde
+TWITTER_SCROLL_STEP = 50  # noduri noi procesate per pas de derulare
+TWITTER_SCROLL_MAX_IDLE = 3  # derulări consecutive fără tweet-uri noi înainte de oprire
+TWITTER_SCROLL_SAVE_BATCH = 20  # tweet-uri salvate per tranzacție
+
+# Configurări backend de scraping Twitter
+TWITTER_SCRAPE_BACKEND = 'dom'  # 'dom' = extragere din pagină, 'network' = răspunsurile JSON din DevTools
+TWITTER_SEARCH_API_MARKER = '/SearchTimeline'  # fragment din URL-ul răspunsurilor capturate
+# Browserele din pool pornesc cu jurnalul DevTools 'performance'; necesar și pentru backend='network' per apel
+TWITTER_NETWORK_CAPTURE = TWITTER_SCRAPE_BACKEND == 'network'
+
+# Configurări profil browser pentru scraping
+BROWSER_PROFILE = 'lean'  # 'lean' = resurse blocate, 'full' = profilul complet anterior
+LEAN_CHROME_ARGUMENTS = [
+    '--blink-settings=imagesEnabled=false',
+    '--mute-audio',
+    '--no-first-run',
+    '--disable-extensions',
+    '--disable-sync',
+    '--disable-default-apps',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication',
+]
+LEAN_CHROME_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.managed_default_content_settings.media_stream': 2,
+    'profile.managed_default_content_settings.plugins': 2,
+    'profile.default_content_setting_values.notifications': 2,
+    'profile.default_content_setting_values.geolocation': 2,
+}
+LEAN_BLOCKED_URLS = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.mp4', '*.m3u8', '*.m4s', '*.ts?*', '*video.twimg.com*', '*pbs.twimg.com/media*',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*ads-twitter.com*', '*ads-api.twitter.com*', '*analytics.twitter.com*',
+]
+
+# Configurări executor Twitter multi-query
+TWITTER_ACCOUNT_CONCURRENCY = 1  # căutări simultane permise per cont
+TWITTER_BATCH_WORKERS = BROWSER_POOL_SIZE  # căutări Twitter rulate în paralel
+TWITTER_BATCH_MAX_QUERIES = 50  # query-uri acceptate într-un singur lot
+
+# Configurări fixture-uri Twitter offline
+TWITTER_FIXTURE_MANIFEST = 'manifest.json'  # descrierea snapshot-urilor dintr-un director de fixture-uri
+TWITTER_FIXTURE_BASE_URL = 'https://x.com/'  # bază pentru link-urile relative din snapshot-uri
+
+# Configurări scriere în baza de date
+DB_INSERT_BATCH_SIZE = 500  # rânduri per INSERT multi-row; 1 = un INSERT per rând
+
+# Pool partajat de thread-uri pentru descărcarea paginilor
+enrich_executor = ThreadPoolExecutor(max_workers=ENRICH_MAX_WORKERS, thread_name_prefix='enrich')
+
 # Variabile globale pentru gestionarea conexiunii
 db = None
 cursor = None
@@ -376,8 +540,624 @@ def construieste_interogare_cautare(operanzi):
             query += f'{op["text"]} '
     return query.strip()
 
-def extrage_info_pagina(result):
-    """Extract information from a search result"""
+class HttpFetchStats:
+    """Contoare thread-safe pentru reutilizarea conexiunilor și durata handshake-urilor"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.handshake_time = 0.0
+        self.dns_hits = 0
+        self.dns_misses = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self, elapsed):
+        with self._lock:
+            self.new_connections += 1
+            self.handshake_time += elapsed
+
+    def record_dns(self, hit):
+        with self._lock:
+            if hit:
+                self.dns_hits += 1
+            else:
+                self.dns_misses += 1
+
+    def snapshot(self):
+        with self._lock:
+            reused = max(self.requests - self.new_connections, 0)
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'reuse_rate': round(reused / self.requests, 3) if self.requests else 0.0,
+                'avg_handshake_ms': round(self.handshake_time * 1000 / self.new_connections, 2) if self.new_connections else 0.0,
+                'dns_hits': self.dns_hits,
+                'dns_misses': self.dns_misses
+            }
+
+http_stats = HttpFetchStats()
+
+class DnsCache:
+    """
+    Cache DNS cu TTL și eliminare LRU, folosit doar de conexiunile clientului HTTP de descărcare.
+    Nu modifică socket.getaddrinfo, deci MySQL, Selenium și SMTP rezolvă numele normal.
+    """
+    def __init__(self, ttl=DNS_CACHE_TTL, max_entries=DNS_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def addresses(self, host, port):
+        """Adresele IP (în ordinea rezolvării) pentru host:port, din cache sau prin getaddrinfo"""
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                http_stats.record_dns(True)
+                return entry[1]
+        infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[key] = (now, addresses)
+            self._entries.move_to_end(key)
+            for stale in [k for k, (stored, _) in self._entries.items() if now - stored >= self.ttl]:
+                del self._entries[stale]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        http_stats.record_dns(False)
+        return addresses
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+dns_cache = DnsCache()
+
+class _CachedDnsConnectionMixin:
+    """
+    Deschide socket-ul către adresele din dns_cache, încercându-le pe rând.
+    Hostname-ul original rămâne în self.host, deci SNI și verificarea certificatului nu se schimbă.
+    """
+    def _new_conn(self):
+        dns_host = self._dns_host
+        try:
+            addresses = dns_cache.addresses(dns_host, self.port)
+        except socket.gaierror:
+            return super()._new_conn()
+        error = None
+        try:
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError) as e:
+                    error = e
+        finally:
+            self._dns_host = dns_host
+        if error is not None:
+            raise error
+        return super()._new_conn()
+
+class _TimedHTTPConnection(_CachedDnsConnectionMixin, HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        http_stats.record_connection(time.perf_counter() - start)
+
+class _TimedHTTPSConnection(_CachedDnsConnectionMixin, HTTPSConnection):
+    def connect(self):
+        # Include și handshake-ul TLS
+        start = time.perf_counter()
+        super().connect()
+        http_stats.record_connection(time.perf_counter() - start)
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+class _PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter care folosește conexiuni instrumentate pentru statistici"""
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool
+        }
+
+class HttpFetchClient:
+    """
+    Client HTTP partajat la nivel de proces pentru toate descărcările de pagini.
+    Implementează pattern-ul Singleton, la fel ca DatabaseConnectionManager.
+    Oferă:
+    - Conexiuni keep-alive reutilizate per host (pool configurabil)
+    - Cache DNS cu TTL și limită LRU, aplicat doar conexiunilor acestui client
+    - Reîncercări cu backoff exponențial pentru erorile temporare
+    - Contoare pentru rata de reutilizare și durata handshake-urilor
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                instance = super(HttpFetchClient, cls).__new__(cls)
+                instance._session = cls._create_session()
+                cls._instance = instance
+                logger.info("Shared HTTP fetch client created")
+        return cls._instance
+
+    @staticmethod
+    def _create_session():
+        retry = Retry(
+            total=HTTP_MAX_RETRIES,
+            backoff_factor=HTTP_BACKOFF_FACTOR,
+            status_forcelist=HTTP_RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        adapter = _PooledHTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=retry,
+            pool_block=False
+        )
+        session = requests.Session()
+        session.headers.update({'User-Agent': HTTP_USER_AGENT})
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def get(self, url, timeout=HTTP_TIMEOUT, **kwargs):
+        http_stats.record_request()
+        return self._session.get(url, timeout=timeout, **kwargs)
+
+    def stats(self):
+        stats = http_stats.snapshot()
+        stats['dns_entries'] = len(dns_cache)
+        return stats
+
+def normalizeaza_url(url):
+    """Normalizează un URL pentru cache: schemă/host cu litere mici, fără fragment și port implicit"""
+    parsed = urllib.parse.urlsplit(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    path = parsed.path or '/'
+    return urllib.parse.urlunsplit((scheme, netloc, path, parsed.query, ''))
+
+class UrlMetadataCache:
+    """
+    Cache persistent (MySQL) pentru metadatele extrase din pagini:
+    - Cheia este SHA-1 al URL-ului normalizat
+    - Păstrează titlul, descrierea, hash-ul conținutului, ETag și Last-Modified
+    - Intrările mai noi de URL_CACHE_TTL sunt servite fără cerere HTTP
+    - Intrările expirate sunt revalidate cu GET condiționat (304 = fără parsare)
+    - Eliminare LRU după last_access când se depășește URL_CACHE_MAX_ENTRIES
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enabled = True
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self._writes_since_eviction = 0
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha1(normalizeaza_url(url).encode('utf-8')).hexdigest()
+
+    def record(self, counter, amount=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def get(self, url):
+        return self.get_many([url]).get(self._key(url))
+
+    def get_many(self, urls):
+        """Citește intrările pentru toate URL-urile printr-un singur SELECT; returnează {url_hash: intrare}"""
+        keys = list(dict.fromkeys(self._key(url) for url in urls))
+        if not self.enabled or not keys:
+            return {}
+        try:
+            rows = execute_db_query(f"""
+                SELECT url_hash, title, description, content_hash, etag, last_modified,
+                       TIMESTAMPDIFF(SECOND, fetched_at, NOW()) AS age
+                FROM url_metadata_cache
+                WHERE url_hash IN ({', '.join(['%s'] * len(keys))})
+            """, tuple(keys))
+            return {row['url_hash']: row for row in rows}
+        except Exception as e:
+            logger.warning(f"URL cache lookup failed for {len(keys)} URLs: {e}")
+            return {}
+
+    def batch(self, urls):
+        """Lot de operații pentru o îmbogățire: o citire acum și o scriere la flush()"""
+        return UrlCacheBatch(self, urls)
+
+    def is_fresh(self, entry):
+        return entry is not None and entry['age'] is not None and entry['age'] < URL_CACHE_TTL
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def touch(self, url, revalidated=False):
+        """Marchează o intrare ca folosită; la revalidare resetează și vârsta ei"""
+        key = self._key(url)
+        self.write_many([] if revalidated else [key], [key] if revalidated else [], [])
+
+    def put(self, url, title, description, content_hash, etag, last_modified):
+        self.write_many([], [], [self.row(url, title, description, content_hash, etag, last_modified)])
+
+    def row(self, url, title, description, content_hash, etag, last_modified):
+        return (self._key(url), normalizeaza_url(url), title, description, content_hash, etag, last_modified)
+
+    def write_many(self, touched, revalidated, rows):
+        """
+        Scrie un lot printr-o singură conexiune: câte un UPDATE pentru intrările folosite
+        și revalidate, plus upsert-ul rândurilor noi prin executemany
+        """
+        if not self.enabled or not (touched or revalidated or rows):
+            return
+        connection = None
+        cursor = None
+        try:
+            connection = DatabaseConnectionManager().get_connection()
+            cursor = connection.cursor()
+            for keys, extra in ((touched, ''), (revalidated, ', fetched_at = NOW()')):
+                if keys:
+                    cursor.execute(f"""
+                        UPDATE url_metadata_cache
+                        SET last_access = NOW(){extra}
+                        WHERE url_hash IN ({', '.join(['%s'] * len(keys))})
+                    """, tuple(keys))
+            if rows:
+                insereaza_in_loturi(cursor, """
+                    INSERT INTO url_metadata_cache
+                    (url_hash, url, title, description, content_hash, etag, last_modified,
+                     fetched_at, last_access)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, NOW(), NOW())
+                    ON DUPLICATE KEY UPDATE
+                        title = VALUES(title),
+                        description = VALUES(description),
+                        content_hash = VALUES(content_hash),
+                        etag = VALUES(etag),
+                        last_modified = VALUES(last_modified),
+                        fetched_at = NOW(),
+                        last_access = NOW()
+                """, rows)
+            connection.commit()
+        except Exception as e:
+            if connection:
+                connection.rollback()
+            logger.warning(f"URL cache write failed for {len(rows)} new and "
+                           f"{len(touched) + len(revalidated)} reused entries: {e}")
+            return
+        finally:
+            if cursor:
+                cursor.close()
+            if connection:
+                connection.close()
+
+        # Verificăm limita de dimensiune doar periodic, nu la fiecare scriere
+        with self._lock:
+            self._writes_since_eviction += len(rows)
+            should_evict = self._writes_since_eviction >= 100
+            if should_evict:
+                self._writes_since_eviction = 0
+        if should_evict:
+            self.evict()
+
+    def evict(self):
+        """Elimină intrările cel mai puțin recent folosite peste URL_CACHE_MAX_ENTRIES"""
+        try:
+            rows = execute_db_query("SELECT COUNT(*) AS total FROM url_metadata_cache")
+            excess = rows[0]['total'] - URL_CACHE_MAX_ENTRIES if rows else 0
+            if excess > 0:
+                execute_db_query("""
+                    DELETE FROM url_metadata_cache
+                    ORDER BY last_access ASC
+                    LIMIT %s
+                """, (excess,), fetch=False)
+                self.record('evictions', excess)
+                logger.info(f"Evicted {excess} entries from URL metadata cache")
+        except Exception as e:
+            logger.warning(f"URL cache eviction failed: {e}")
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.revalidated + self.misses
+            return {
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round((self.hits + self.revalidated) / lookups, 3) if lookups else 0.0
+            }
+
+class UrlCacheBatch:
+    """
+    Operațiile cache-ului pentru un lot de îmbogățire, cu aceeași interfață get/touch/put:
+    intrările sunt citite o singură dată la creare, iar scrierile sunt adunate și trimise la flush(),
+    deci thread-urile de îmbogățire nu mai ocupă câte o conexiune din pool pentru fiecare URL.
+    Scrierile adăugate după flush() (de benzile care au depășit termenul limită) sunt ignorate.
+    """
+    def __init__(self, cache, urls):
+        self.cache = cache
+        self.entries = cache.get_many(urls)
+        self._lock = threading.Lock()
+        self._touched = []
+        self._revalidated = []
+        self._rows = []
+        self._flushed = False
+
+    def get(self, url):
+        return self.entries.get(UrlMetadataCache._key(url))
+
+    def touch(self, url, revalidated=False):
+        with self._lock:
+            if not self._flushed:
+                (self._revalidated if revalidated else self._touched).append(UrlMetadataCache._key(url))
+
+    def put(self, url, title, description, content_hash, etag, last_modified):
+        with self._lock:
+            if not self._flushed:
+                self._rows.append(self.cache.row(url, title, description, content_hash, etag, last_modified))
+
+    def flush(self):
+        with self._lock:
+            self._flushed = True
+            touched, revalidated, rows = self._touched, self._revalidated, self._rows
+        self.cache.write_many(touched, revalidated, rows)
+
+url_cache = UrlMetadataCache()
+
+_CHARSET_META_RE = re.compile(rb'<meta[^>]+charset=["\']?\s*([\w-]+)', re.IGNORECASE)
+
+def detecteaza_charset(response, data):
+    """
+    Determină codificarea paginii fără a parcurge tot corpul răspunsului:
+    - charset din header-ul Content-Type
+    - <meta charset> / <meta http-equiv> din octeții deja citiți
+    - detecție statistică doar pe octeții deja citiți
+    """
+    content_type = response.headers.get('Content-Type', '')
+    if 'charset=' in content_type.lower():
+        return content_type.lower().split('charset=')[-1].split(';')[0].strip().strip('"\'')
+    meta_match = _CHARSET_META_RE.search(data[:4096])
+    if meta_match:
+        return meta_match.group(1).decode('ascii', 'ignore')
+    try:
+        return requests.compat.chardet.detect(data).get('encoding') or 'utf-8'
+    except Exception:
+        return 'utf-8'
+
+_HTML_DESCRIPTION_MARKERS = (b'name="description"', b"name='description'", b'og:description')
+_HTML_MARKER_OVERLAP = 32  # mai mare decât cel mai lung marcaj căutat
+
+def citeste_html_partial(response, max_bytes=HTML_HEAD_MAX_BYTES):
+    """
+    Citește răspunsul incremental și se oprește cât mai devreme:
+    - după </head>, dacă head-ul conține deja o descriere meta
+    - altfel după primul </p>
+    - în orice caz la atingerea bugetului max_bytes
+    """
+    buffer = bytearray()
+    head_end = -1
+    has_description = False
+    for chunk in response.iter_content(chunk_size=HTML_CHUNK_SIZE):
+        # Se scanează doar bucata nouă plus o suprapunere pentru marcajele tăiate între bucăți
+        start = max(0, len(buffer) - _HTML_MARKER_OVERLAP)
+        buffer.extend(chunk)
+        window = bytes(buffer[start:]).lower()
+        if head_end == -1:
+            position = window.find(b'</head>')
+            head = window if position == -1 else window[:position]
+            has_description = has_description or any(marker in head for marker in _HTML_DESCRIPTION_MARKERS)
+            if position != -1:
+                head_end = start + position
+                if has_description:
+                    break
+        if head_end != -1 and window.find(b'</p>', max(0, head_end - start)) != -1:
+            break
+        if len(buffer) >= max_bytes:
+            logger.debug(f"HTML byte budget of {max_bytes} reached for {response.url}")
+            break
+    response.close()
+    return bytes(buffer[:max_bytes])
+
+def citeste_pana_la_buget(response, max_bytes):
+    """Citește răspunsul incremental și oprește descărcarea la atingerea bugetului max_bytes"""
+    buffer = bytearray()
+    for chunk in response.iter_content(chunk_size=HTML_CHUNK_SIZE):
+        buffer.extend(chunk)
+        if len(buffer) >= max_bytes:
+            logger.debug(f"HTML byte budget of {max_bytes} reached for {response.url}")
+            break
+    response.close()
+    return bytes(buffer[:max_bytes])
+
+class PdfExtractionStats:
+    """Contoare pentru extragerea PDF, folosite la calibrarea PDF_WORKERS / PDF_MAX_PAGES"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.documents = 0
+        self.pages = 0
+        self.elapsed = 0.0
+        self.skipped = 0
+
+    def record(self, pages, elapsed):
+        with self._lock:
+            self.documents += 1
+            self.pages += pages
+            self.elapsed += elapsed
+
+    def record_skip(self):
+        with self._lock:
+            self.skipped += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'documents': self.documents,
+                'pages': self.pages,
+                'skipped': self.skipped,
+                'pages_per_sec': round(self.pages / self.elapsed, 2) if self.elapsed else 0.0
+            }
+
+pdf_stats = PdfExtractionStats()
+_pdf_executor = None
+_pdf_executor_lock = threading.Lock()
+
+def get_pdf_executor():
+    """Creează la prima utilizare pool-ul de procese pentru PDF-uri"""
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is None:
+            _pdf_executor = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+        return _pdf_executor
+
+def reseteaza_pdf_executor(executor):
+    """
+    Oprește forțat pool-ul de procese după o extragere blocată și îl lasă să fie recreat
+    la următoarea cerere; altfel worker-ul blocat ar ocupa în continuare un loc din PDF_WORKERS.
+    """
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is not executor:
+            return
+        _pdf_executor = None
+    for process in list((getattr(executor, '_processes', None) or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+    logger.warning("PDF worker pool terminated after a timeout and will be recreated")
+
+def descarca_pdf(response, max_bytes=PDF_MAX_BYTES):
+    """
+    Descarcă un PDF respectând limita de dimensiune.
+    PDF-urile mici rămân în memorie (bytes); cele peste PDF_SPOOL_THRESHOLD
+    sunt scrise într-un fișier temporar și se returnează calea acestuia.
+    Returnează None dacă PDF-ul depășește max_bytes.
+    """
+    declared = response.headers.get('Content-Length')
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        response.close()
+        return None
+
+    buffer = io.BytesIO()
+    temp_file = None
+    size = 0
+    completed = False
+    try:
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > max_bytes:
+                return None
+            if temp_file is None and size > PDF_SPOOL_THRESHOLD:
+                temp_file = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
+                temp_file.write(buffer.getvalue())
+                buffer = None
+            (temp_file or buffer).write(chunk)
+        completed = True
+    finally:
+        response.close()
+        if temp_file:
+            temp_file.close()
+            # PDF prea mare sau descărcare întreruptă (timeout, conexiune resetată) - fișierul nu este folosit
+            if not completed:
+                os.unlink(temp_file.name)
+
+    if temp_file:
+        return temp_file.name
+    return buffer.getvalue()
+
+def proceseaza_pdf(response, pages=None):
+    """
+    Extrage textul unui PDF în afara thread-ului cererii, într-un proces separat.
+    pages este un tuplu (first_page, last_page); implicit primele PDF_MAX_PAGES pagini.
+    Returnează (text, octeți pentru hash) sau ('', b'') dacă PDF-ul e ignorat.
+    """
+    first_page, last_page = pages or (0, PDF_MAX_PAGES)
+    source = descarca_pdf(response)
+    if source is None:
+        pdf_stats.record_skip()
+        logger.warning(f"PDF {response.url} exceeds {PDF_MAX_BYTES} bytes, skipping text extraction")
+        return '', b''
+    executor = get_pdf_executor()
+    try:
+        future = executor.submit(extrage_text_pdf, source, first_page, last_page)
+        try:
+            result = future.result(timeout=PDF_TIMEOUT)
+        except FutureTimeoutError:
+            reseteaza_pdf_executor(executor)
+            raise
+        pdf_stats.record(result['pages'], result['elapsed'])
+        logger.info(f"Extracted {result['pages']}/{result['total_pages']} PDF pages from {response.url} "
+                    f"({result['pages'] / result['elapsed'] if result['elapsed'] else 0:.1f} pages/sec)")
+        if isinstance(source, bytes):
+            return result['text'], source
+        return result['text'], result['text'].encode('utf-8')
+    finally:
+        if not isinstance(source, bytes):
+            try:
+                os.unlink(source)
+            except OSError:
+                pass
+
+def extrage_titlu_descriere(soup):
+    """Extrage titlul și descrierea dintr-un document HTML (complet sau parțial)"""
+    title = ''
+    description = ''
+
+    # Try multiple ways to get title
+    if soup.title and soup.title.string:
+        title = soup.title.string
+    elif soup.find('meta', property='og:title'):
+        title = soup.find('meta', property='og:title').get('content', '')
+    elif soup.find('h1'):
+        title = soup.find('h1').get_text()
+
+    # Try multiple ways to get description
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    og_desc = soup.find('meta', property='og:description')
+    if meta_desc and meta_desc.get('content'):
+        description = meta_desc['content']
+    elif og_desc and og_desc.get('content'):
+        description = og_desc['content']
+    else:
+        # Get first paragraph or first few sentences
+        first_p = soup.find('p')
+        if first_p:
+            description = first_p.get_text()[:200]
+
+    return title, description
+
+def extrage_info_pagina(result, deep=False, full_text=False, pdf_pages=None, cache=None):
+    """
+    Extract information from a search result.
+    Cu deep=True, pentru obiectele SearchResult se descarcă și pagina propriu-zisă;
+    titlul/descrierea din SearchResult rămân fallback dacă pagina nu oferă nimic.
+    Implicit, paginile HTML sunt citite doar până la </head> (sau primul paragraf);
+    full_text=True descarcă tot documentul și returnează și textul complet.
+    pdf_pages=(first_page, last_page) limitează paginile extrase din PDF-uri.
+    cache: lotul UrlCacheBatch al îmbogățirii curente (implicit url_cache, cu o conexiune per operație).
+    """
     try:
         # Handle SearchResult objects
         if hasattr(result, 'url'):
@@ -385,62 +1165,78 @@ def extrage_info_pagina(result):
             # Use the title and description from SearchResult if available
             title = getattr(result, 'title', None) or url.split('/')[-1]
             description = getattr(result, 'description', '') or 'No description available'
+            if deep:
+                page_title, page_description, content = extrage_info_pagina(url, full_text=full_text,
+                                                                            pdf_pages=pdf_pages, cache=cache)
+                return (page_title if page_title not in ('', url, url.split('/')[-1]) else title,
+                        page_description or description,
+                        content)
             return title, description, ''
             
         # Handle string URLs
         elif isinstance(result, str):
             url = result
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=5)
-            response.encoding = response.apparent_encoding
+
+            # Verificăm mai întâi cache-ul persistent (nu conține textul complet)
+            cache = cache or url_cache
+            cached = cache.get(url)
+            if url_cache.is_fresh(cached) and not full_text:
+                url_cache.record('hits')
+                cache.touch(url)
+                return cached['title'], cached['description'], ''
+
+            response = HttpFetchClient().get(
+                url,
+                headers={} if full_text else UrlMetadataCache.conditional_headers(cached),
+                stream=True
+            )
+            if response.status_code == 304 and cached:
+                # Pagina nu s-a modificat - nu mai parsăm nimic
+                response.close()
+                url_cache.record('revalidated')
+                cache.touch(url, revalidated=True)
+                return cached['title'], cached['description'], ''
+            url_cache.record('misses')
             content_type = response.headers.get('Content-Type', '').lower()
 
             title = ''
             description = ''
             content = ''
+            raw = b''
 
             # Handle HTML content
             if 'text/html' in content_type:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Try multiple ways to get title
-                if soup.title:
-                    title = soup.title.string
-                elif soup.find('meta', property='og:title'):
-                    title = soup.find('meta', property='og:title')['content']
-                elif soup.find('h1'):
-                    title = soup.find('h1').get_text()
-                
-                # Try multiple ways to get description
-                meta_desc = soup.find('meta', attrs={'name': 'description'})
-                og_desc = soup.find('meta', property='og:description')
-                if meta_desc and meta_desc.get('content'):
-                    description = meta_desc['content']
-                elif og_desc and og_desc.get('content'):
-                    description = og_desc['content']
+                max_bytes = HTML_FULL_MAX_BYTES if full_text else HTML_HEAD_MAX_BYTES
+                if full_text:
+                    raw = citeste_pana_la_buget(response, max_bytes)
                 else:
-                    # Get first paragraph or first few sentences
-                    first_p = soup.find('p')
-                    if first_p:
-                        description = first_p.get_text()[:200]
-                
-                content = soup.get_text()
+                    raw = citeste_html_partial(response, max_bytes)
+                html = raw.decode(detecteaza_charset(response, raw), errors='replace')
+                soup = BeautifulSoup(html, 'html.parser')
+                title, description = extrage_titlu_descriere(soup)
+                if full_text:
+                    content = soup.get_text()
 
             elif 'application/pdf' in content_type:
                 try:
-                    pdf_reader = PyPDF2.PdfReader(io.BytesIO(response.content))
                     title = url.split('/')[-1]
-                    content = ""
-                    for page in pdf_reader.pages:
-                        content += page.extract_text()
+                    content, raw = proceseaza_pdf(response, pdf_pages)
                     description = content[:200] if content else ''
                 except Exception as e:
                     print(f"PDF processing error: {e}")
+            else:
+                response.close()
 
             title = title.strip() if title else url.split('/')[-1]
             description = description.strip() if description else content[:200].strip()
+
+            if response.ok and raw:
+                cache.put(
+                    url, title, description,
+                    hashlib.sha1(raw).hexdigest(),
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified')
+                )
             
             return title, description, content
 
@@ -454,224 +1250,1292 @@ def extrage_info_pagina(result):
             return result.title, result.description, ''
         return str(result), '', ''
 
-def login_to_twitter(driver):
+def _rezultat_fallback(result):
+    """Construiește rezultatul doar din titlul/descrierea SearchResult, fără descărcarea paginii"""
+    link = result.url if hasattr(result, 'url') else str(result)
+    title = getattr(result, 'title', None) or link.split('/')[-1]
+    description = getattr(result, 'description', '') or 'No description available'
+    return {'link': link, 'title': title, 'description': description}
+
+def _benzi_per_host(search_results):
+    """
+    Împarte rezultatele pe host-uri și fiecare host în cel mult ENRICH_PER_HOST_LIMIT benzi.
+    Returnează liste de (index, result); o bandă este procesată secvențial de un singur task,
+    deci limita per host nu mai blochează thread-uri din pool-ul partajat.
+    """
+    by_host = defaultdict(list)
+    for index, result in enumerate(search_results):
+        link = result.url if hasattr(result, 'url') else str(result)
+        by_host[urlparse(link).netloc].append((index, result))
+    lanes = []
+    for items in by_host.values():
+        count = min(ENRICH_PER_HOST_LIMIT, len(items))
+        lanes.extend(items[lane::count] for lane in range(count))
+    return lanes
+
+def _extrage_banda_host(items, results, expired, cache=None):
+    """Rulează extrage_info_pagina în modul deep pentru o bandă; se oprește la expirarea termenului limită"""
+    for index, result in items:
+        if expired.is_set():
+            return
+        link = result.url if hasattr(result, 'url') else str(result)
+        try:
+            title, description, _ = extrage_info_pagina(result, deep=True, cache=cache)
+            results[index] = {'link': link, 'title': title, 'description': description}
+        except Exception as e:
+            logger.error(f"Error processing result {link}: {str(e)}")
+
+def imbogateste_rezultate(search_results, deep=False, deadline=None):
+    """
+    Procesează rezultatele căutării Google și returnează lista de dicționare link/title/description.
+    - Modul implicit folosește doar datele din SearchResult, secvențial
+    - Modul deep descarcă paginile concurent, printr-un pool limitat de thread-uri,
+      grupate pe host (cel mult ENRICH_PER_HOST_LIMIT benzi per host) și cu un termen limită global
+    - Rezultatele care depășesc termenul limită revin la titlul/descrierea din SearchResult;
+      benzile încă în lucru se opresc după pagina curentă, fără să consume bugetul căutării următoare
+    """
+    results_with_info = []
+    if not deep:
+        for result in search_results:
+            try:
+                title, description, _ = extrage_info_pagina(result)
+                results_with_info.append({
+                    'link': result.url if hasattr(result, 'url') else str(result),
+                    'title': title,
+                    'description': description
+                })
+                logger.debug(f"Processed result: {title}")
+            except Exception as e:
+                logger.error(f"Error processing result: {str(e)}")
+                continue
+        return results_with_info
+
+    deadline = ENRICH_DEADLINE if deadline is None else deadline
+    enriched = {}
+    expired = threading.Event()
+    # O citire a cache-ului pentru tot lotul și o scriere la final, nu câte o conexiune per URL
+    cache = url_cache.batch([result.url if hasattr(result, 'url') else str(result) for result in search_results])
+    futures = [
+        enrich_executor.submit(_extrage_banda_host, items, enriched, expired, cache)
+        for items in _benzi_per_host(search_results)
+    ]
+    _, not_done = wait(futures, timeout=deadline)
+    expired.set()
+    for future in not_done:
+        future.cancel()
+    cache.flush()
+    # Instantaneu al rezultatelor terminate; benzile întârziate nu mai pot modifica lista returnată
+    enriched = dict(enriched)
+    missing = len(search_results) - len(enriched)
+    if missing:
+        logger.warning(f"Deep enrichment deadline of {deadline}s exceeded for {missing} results, using fallback")
+
+    # Păstrăm ordinea originală a rezultatelor
+    for index, result in enumerate(search_results):
+        results_with_info.append(enriched.get(index) or _rezultat_fallback(result))
+    return results_with_info
+
+class _TokenBucket:
+    """Bucket de token-uri pentru o singură sursă, cu coadă FIFO de așteptare"""
+    def __init__(self, rate, min_rate, max_rate, burst):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.condition = threading.Condition()
+        self.next_ticket = 0
+        self.serving = 0
+        self.granted = 0
+        self.errors = 0
+        self.wait_time = 0.0
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+class AdaptiveRateLimiter:
+    """
+    Limitator global de rată, partajat de cererile web și de job-urile programate:
+    - Un bucket de token-uri per sursă (google, twitter), configurat în RATE_LIMITS
+    - Ajustare AIMD: rata crește aditiv după succes și scade multiplicativ după erori
+    - Cererile așteaptă la rând (FIFO) până la următorul token disponibil,
+      în loc de pauze fixe în fiecare thread
+    """
+    def __init__(self, limits):
+        self._buckets = {source: _TokenBucket(**config) for source, config in limits.items()}
+        self.enabled = True
+
+    def acquire(self, source):
+        if not self.enabled:
+            return
+        bucket = self._buckets[source]
+        start = time.monotonic()
+        with bucket.condition:
+            ticket = bucket.next_ticket
+            bucket.next_ticket += 1
+            while True:
+                bucket.refill()
+                if bucket.serving == ticket and bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    bucket.serving += 1
+                    bucket.granted += 1
+                    bucket.wait_time += time.monotonic() - start
+                    bucket.condition.notify_all()
+                    return
+                if bucket.serving == ticket:
+                    # Suntem primii la rând - așteptăm exact cât durează următorul token
+                    bucket.condition.wait((1 - bucket.tokens) / bucket.rate)
+                else:
+                    bucket.condition.wait()
+
+    def add_source(self, source, config):
+        """Înregistrează o sursă nouă (ex. un cont Twitter suplimentar) cu propriul bucket"""
+        self._buckets.setdefault(source, _TokenBucket(**config))
+
+    def report_success(self, source):
+        bucket = self._buckets[source]
+        with bucket.condition:
+            bucket.refill()
+            bucket.rate = min(bucket.max_rate, bucket.rate + RATE_INCREASE_STEP)
+
+    def report_error(self, source):
+        bucket = self._buckets[source]
+        with bucket.condition:
+            bucket.refill()
+            bucket.errors += 1
+            bucket.rate = max(bucket.min_rate, bucket.rate * RATE_DECREASE_FACTOR)
+            logger.warning(f"Rate limit for {source} reduced to {bucket.rate:.3f} requests/sec")
+
+    def stats(self):
+        snapshot = {}
+        for source, bucket in self._buckets.items():
+            with bucket.condition:
+                snapshot[source] = {
+                    'rate': round(bucket.rate, 3),
+                    'granted': bucket.granted,
+                    'errors': bucket.errors,
+                    'queued': bucket.next_ticket - bucket.serving,
+                    'avg_wait_sec': round(bucket.wait_time / bucket.granted, 3) if bucket.granted else 0.0
+                }
+        return snapshot
+
+rate_limiter = AdaptiveRateLimiter(RATE_LIMITS)
+
+class AdaptiveWaiter:
+    """
+    Așteptări bazate pe condiții de pregătire (selectori, DOM stabil, rețea inactivă),
+    în locul pauzelor fixe:
+    - Fiecare așteptare are un nume și i se înregistrează durata reală
+    - Timeout-ul se adaptează la durata observată (p95 × WAIT_TIMEOUT_MULTIPLIER),
+      în limitele [WAIT_MIN_TIMEOUT, WAIT_MAX_TIMEOUT]
+    - După un timeout, așteptarea respectivă revine la timeout-ul maxim
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=WAIT_SAMPLE_SIZE))
+        self._timeouts = defaultdict(int)
+
+    def timeout_for(self, name):
+        with self._lock:
+            samples = list(self._samples[name])
+        if len(samples) < 5:
+            return WAIT_MAX_TIMEOUT
+        return min(WAIT_MAX_TIMEOUT, max(WAIT_MIN_TIMEOUT, _percentile(samples, 95) * WAIT_TIMEOUT_MULTIPLIER))
+
+    def until(self, driver, name, condition, timeout=None):
+        timeout = timeout or self.timeout_for(name)
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_INTERVAL).until(condition)
+        except TimeoutException:
+            with self._lock:
+                self._timeouts[name] += 1
+                self._samples[name].clear()
+            logger.debug(f"Wait '{name}' timed out after {timeout:.1f}s")
+            raise
+        with self._lock:
+            self._samples[name].append(time.perf_counter() - start)
+        return result
+
+    def stats(self):
+        with self._lock:
+            names = set(self._samples) | set(self._timeouts)
+            snapshot = {}
+            for name in names:
+                samples = list(self._samples[name])
+                snapshot[name] = {
+                    'samples': len(samples),
+                    'avg_sec': round(statistics.mean(samples), 3) if samples else 0.0,
+                    'p95_sec': round(_percentile(samples, 95), 3) if samples else 0.0,
+                    'timeouts': self._timeouts[name]
+                }
+        return snapshot
+
+waiter = AdaptiveWaiter()
+
+def dom_stabil(quiet_ms=WAIT_DOM_QUIET_MS):
+    """Condiție: nicio mutație în DOM în ultimele quiet_ms milisecunde (MutationObserver)"""
+    script = """
+        if (!window.__osintMutationObserver) {
+            window.__osintLastMutation = Date.now();
+            window.__osintMutationObserver = new MutationObserver(function() {
+                window.__osintLastMutation = Date.now();
+            });
+            window.__osintMutationObserver.observe(document, {childList: true, subtree: true, attributes: true});
+            return false;
+        }
+        return Date.now() - window.__osintLastMutation >= arguments[0];
+    """
+    return lambda driver: driver.execute_script(script, quiet_ms)
+
+def retea_inactiva(quiet_ms=WAIT_NETWORK_QUIET_MS):
+    """Condiție: document încărcat și nicio resursă terminată în ultimele quiet_ms milisecunde"""
+    script = """
+        if (document.readyState !== 'complete') { return false; }
+        var entries = performance.getEntriesByType('resource');
+        var last = 0;
+        for (var i = 0; i < entries.length; i++) { last = Math.max(last, entries[i].responseEnd); }
+        return performance.now() - last >= arguments[0];
+    """
+    return lambda driver: driver.execute_script(script, quiet_ms)
+
+def oricare_selector(selectors):
+    """Condiție: returnează (selector, elemente) pentru primul selector CSS prezent în pagină"""
+    def condition(driver):
+        for selector in selectors:
+            elements = driver.find_elements(By.CSS_SELECTOR, selector)
+            if elements:
+                return selector, elements
+        return False
+    return condition
+
+class TwitterAccount:
+    """Un cont Twitter: credențiale, fișierul propriu de sesiune și bucket-ul propriu de rată"""
+    def __init__(self, credentials, session_file, rate_source, max_concurrency=TWITTER_ACCOUNT_CONCURRENCY):
+        self.name = credentials['username']
+        self.credentials = credentials
+        self.session_file = session_file
+        self.rate_source = rate_source
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        self.queries = 0
+
+class TwitterAccountPool:
+    """
+    Conturile Twitter disponibile pentru scraping:
+    - Contul principal (TWITTER_CREDENTIALS) păstrează sesiunea și limita de rată 'twitter'
+    - Conturile din TWITTER_ACCOUNTS primesc sesiune și bucket de rată separate
+    - Fiecare cont rulează cel mult max_concurrency căutări simultan; căutarea nouă
+      primește contul cel mai puțin ocupat
+    """
+    def __init__(self, default_credentials, extra_credentials):
+        self.default = TwitterAccount(default_credentials, TWITTER_SESSION_FILE, 'twitter')
+        self.accounts = [self.default]
+        for credentials in extra_credentials:
+            if credentials['username'] == self.default.name:
+                continue
+            rate_source = f"twitter:{credentials['username']}"
+            rate_limiter.add_source(rate_source, RATE_LIMITS['twitter'])
+            self.accounts.append(TwitterAccount(
+                credentials, f"twitter_session_{credentials['username']}.json", rate_source,
+                credentials.get('max_concurrency', TWITTER_ACCOUNT_CONCURRENCY)
+            ))
+        self._condition = threading.Condition()
+
+    @property
+    def capacity(self):
+        return sum(account.max_concurrency for account in self.accounts)
+
+    @contextmanager
+    def acquire(self):
+        with self._condition:
+            while True:
+                free = [a for a in self.accounts if a.active < a.max_concurrency]
+                if free:
+                    account = min(free, key=lambda a: (a.active, a.queries))
+                    account.active += 1
+                    break
+                self._condition.wait()
+        try:
+            yield account
+        finally:
+            with self._condition:
+                account.active -= 1
+                account.queries += 1
+                self._condition.notify_all()
+
+    def stats(self):
+        with self._condition:
+            return {
+                account.name: {
+                    'active': account.active,
+                    'max_concurrency': account.max_concurrency,
+                    'queries': account.queries,
+                    'rate_source': account.rate_source
+                }
+                for account in self.accounts
+            }
+
+twitter_accounts = TwitterAccountPool(TWITTER_CREDENTIALS, TWITTER_ACCOUNTS)
+
+def login_to_twitter(driver, account=None):
     """Handle Twitter login process"""
+    account = account or twitter_accounts.default
     try:
         # Navigate to Twitter login page
+        rate_limiter.acquire(account.rate_source)
         driver.get("https://twitter.com/login")
-        import time
-        time.sleep(3)  # Wait for login page to load
         
         # Wait for and fill in username
-        username_input = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, 'input[autocomplete="username"]'))
+        username_input = waiter.until(
+            driver, 'login_username',
+            EC.element_to_be_clickable((By.CSS_SELECTOR, 'input[autocomplete="username"]'))
         )
-        username_input.send_keys(TWITTER_CREDENTIALS['username'])
+        username_input.send_keys(account.credentials['username'])
         
         # Click the 'Next' button
         next_button = driver.find_element(By.XPATH, "//span[text()='Next']")
         next_button.click()
-        time.sleep(2)
         
         # Wait for and fill in password
-        password_input = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, 'input[type="password"]'))
+        password_input = waiter.until(
+            driver, 'login_password',
+            EC.element_to_be_clickable((By.CSS_SELECTOR, 'input[type="password"]'))
         )
-        password_input.send_keys(TWITTER_CREDENTIALS['password'])
+        password_input.send_keys(account.credentials['password'])
         
         # Click the 'Log in' button
         login_button = driver.find_element(By.XPATH, "//span[text()='Log in']")
         login_button.click()
         
-        # Wait for login to complete
-        time.sleep(5)
+        # Wait for login to complete - cookie-ul de autentificare apare imediat după succes
+        waiter.until(driver, 'login_complete', lambda d: d.get_cookie(TWITTER_AUTH_COOKIE))
         return True
         
     except Exception as e:
         logger.error(f"Login error: {str(e)}")
         return False
 
-def scrape_twitter(search_query):
+_twitter_session_lock = threading.Lock()
+
+def salveaza_sesiune_twitter(driver, account=None):
+    """Salvează cookie-urile sesiunii Twitter autentificate pentru căutările următoare"""
+    account = account or twitter_accounts.default
+    try:
+        cookies = driver.get_cookies()
+        with _twitter_session_lock:
+            with open(account.session_file, 'w', encoding='utf-8') as f:
+                json.dump(cookies, f)
+        logger.info(f"Saved Twitter session ({len(cookies)} cookies)")
+    except Exception as e:
+        logger.warning(f"Could not save Twitter session: {e}")
+
+def incarca_sesiune_twitter(driver, account=None):
+    """Încarcă în browser cookie-urile salvate; returnează False dacă nu există o sesiune salvată"""
+    account = account or twitter_accounts.default
+    with _twitter_session_lock:
+        if not os.path.exists(account.session_file):
+            return False
+        try:
+            with open(account.session_file, encoding='utf-8') as f:
+                cookies = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read saved Twitter session: {e}")
+            return False
+
+    auth_cookie = next((c for c in cookies if c.get('name') == TWITTER_AUTH_COOKIE), None)
+    if not auth_cookie or auth_cookie.get('expiry', float('inf')) <= time.time():
+        return False
+
+    # Cookie-urile pot fi adăugate doar pe domeniul lor; robots.txt este cea mai ieftină pagină
+    domain = auth_cookie.get('domain', '.twitter.com').lstrip('.')
+    driver.get(f"https://{domain}/robots.txt")
+    for cookie in cookies:
+        cookie = {k: v for k, v in cookie.items() if k in ('name', 'value', 'domain', 'path', 'expiry', 'secure', 'httpOnly')}
+        try:
+            driver.add_cookie(cookie)
+        except Exception as e:
+            logger.debug(f"Skipping cookie {cookie.get('name')}: {e}")
+    return True
+
+def sesiune_twitter_valida(driver):
+    """Verificare ieftină, fără navigare: browser-ul are un cookie de autentificare neexpirat"""
+    try:
+        auth_cookie = driver.get_cookie(TWITTER_AUTH_COOKIE)
+    except Exception:
+        return False
+    return bool(auth_cookie) and auth_cookie.get('expiry', float('inf')) > time.time()
+
+def sesiune_expirata(driver):
+    """Twitter redirecționează către pagina de login când sesiunea nu mai este acceptată"""
+    current_url = driver.current_url
+    return '/login' in current_url or '/i/flow/login' in current_url
+
+def sterge_cookieuri_browser(driver):
     """
-    Extrage rezultate de pe Twitter folosind Selenium:
-    - Gestionează autentificarea (dacă este necesară)
-    - Procesează rezultatele paginii
-    - Extrage metricile pentru fiecare tweet
-    - Gestionează diferite selectors pentru robustețe
+    Șterge cookie-urile tuturor domeniilor prin DevTools. delete_all_cookies afectează doar
+    originea tab-ului curent (de obicei about:blank), deci sesiunea x.com ar rămâne în browser.
+    """
+    driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+
+def sterge_sesiune_twitter(driver, account=None):
+    """Elimină sesiunea invalidă din browser și de pe disc"""
+    account = account or twitter_accounts.default
+    try:
+        sterge_cookieuri_browser(driver)
+    except Exception:
+        pass
+    with _twitter_session_lock:
+        if os.path.exists(account.session_file):
+            os.remove(account.session_file)
+
+def asigura_sesiune_twitter(driver, account=None):
+    """
+    Asigură o sesiune Twitter autentificată în browser:
+    - Folosește cookie-urile deja prezente în browser, dacă sunt valide
+    - Altfel încarcă sesiunea salvată pe disc
+    - Se autentifică din nou (și salvează sesiunea) doar dacă nu există una validă
+    """
+    if sesiune_twitter_valida(driver):
+        return True
+    if incarca_sesiune_twitter(driver, account) and sesiune_twitter_valida(driver):
+        logger.info("Reusing saved Twitter session")
+        return True
+    if login_to_twitter(driver, account):
+        salveaza_sesiune_twitter(driver, account)
+        return True
+    return False
+
+def asteapta_inainte_de_reincercare(driver):
+    """Între reîncercări așteptăm liniștirea rețelei, nu o pauză fixă"""
+    try:
+        waiter.until(driver, 'retry_network_idle', retea_inactiva())
+    except TimeoutException:
+        pass
+
+def creeaza_optiuni_chrome(profile=None):
+    """
+    Opțiunile Chrome folosite pentru scraping-ul Twitter
+    - 'full': profilul complet, încarcă toate resursele paginii
+    - 'lean': fără imagini/media/fonturi, fereastră mică și funcții Chrome inutile dezactivate
     """
+    profile = profile or BROWSER_PROFILE
     chrome_options = Options()
     chrome_options.add_argument('--headless')
     chrome_options.add_argument('--disable-gpu')
     chrome_options.add_argument('--no-sandbox')
     chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--window-size=1920,1080')
     chrome_options.add_argument('--disable-notifications')
+    if profile == 'lean':
+        chrome_options.add_argument('--window-size=1280,800')
+        for argument in LEAN_CHROME_ARGUMENTS:
+            chrome_options.add_argument(argument)
+        chrome_options.add_experimental_option('prefs', LEAN_CHROME_PREFS)
+    else:
+        chrome_options.add_argument('--window-size=1920,1080')
     chrome_options.add_argument('--lang=en-US')
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    if TWITTER_NETWORK_CAPTURE:
+        # Necesar pentru capturarea răspunsurilor JSON prin jurnalul DevTools
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return chrome_options
+
+def aplica_profil_browser(driver, profile=None):
+    """
+    Blochează prin DevTools cererile inutile (media, fonturi, scripturi terțe) pentru profilul 'lean'.
+    Starea Network din DevTools este per tab, deci se aplică în fiecare tab nou (PooledDriver.open_tab).
+    """
+    if (profile or BROWSER_PROFILE) != 'lean':
+        return
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+    except Exception as e:
+        logger.warning(f"Could not install request blocking: {e}")
+
+class PooledDriver:
+    """Un WebDriver de lungă durată din ChromeDriverPool, cu starea lui de utilizare"""
+    def __init__(self, driver, profile=None):
+        self.driver = driver
+        self.profile = profile
+        self.uses = 0
+        self.created = time.time()
+        self.logged_in = False
+        self.account = None
+        self.broken = False
+        self.base_handle = driver.current_window_handle
+        self.baseline_rss = self.rss_mb()
+
+    def is_healthy(self):
+        try:
+            self.driver.switch_to.window(self.base_handle)
+            return self.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def js_heap_mb(self):
+        try:
+            used = self.driver.execute_script(
+                'return performance.memory ? performance.memory.usedJSHeapSize : 0')
+            return (used or 0) / (1024 * 1024)
+        except Exception:
+            return 0
+
+    def rss_mb(self):
+        """RSS total al chromedriver și al proceselor Chrome pornite de el; None fără /proc"""
+        try:
+            return _rss_arbore_procese(self.driver.service.process.pid)
+        except Exception:
+            return None
+
+    def memory_exceeded(self):
+        """
+        Verifică pragul de memorie cât timp tab-ul căutării este încă deschis:
+        - creșterea RSS a arborelui de procese Chrome față de pornire, unde /proc există
+        - altfel heap-ul JS al tab-ului curent
+        """
+        rss = self.rss_mb()
+        if rss is not None and self.baseline_rss is not None:
+            return rss - self.baseline_rss > BROWSER_MAX_RSS_GROWTH_MB
+        return self.js_heap_mb() > BROWSER_MAX_HEAP_MB
+
+    def open_tab(self):
+        # Fiecare căutare rulează într-un tab nou, izolat de căutările anterioare
+        self.driver.switch_to.new_window('tab')
+        aplica_profil_browser(self.driver, self.profile)
+
+    def close_tab(self):
+        if self.driver.current_window_handle != self.base_handle:
+            self.driver.close()
+        self.driver.switch_to.window(self.base_handle)
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+class ChromeDriverPool:
+    """
+    Pool limitat de instanțe Chrome WebDriver, partajat de endpoint-uri și scheduler:
+    - Browser-ele sunt împrumutate și returnate, nu pornite la fiecare căutare
+    - Verificare de sănătate la fiecare împrumut
+    - Reciclare după BROWSER_MAX_USES utilizări sau la creșterea memoriei peste prag
+    - Izolare la nivel de tab între căutări
+    """
+    def __init__(self, size):
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._all = set()
+        self.launched = 0
+        self.recycled = 0
+        self.borrowed = 0
+
+    def _launch(self):
+        driver = webdriver.Chrome(options=creeaza_optiuni_chrome())
+        pooled = PooledDriver(driver)
+        with self._lock:
+            self._all.add(pooled)
+            self.launched += 1
+        logger.info("Launched new pooled Chrome instance")
+        return pooled
+
+    def _discard(self, pooled, reason):
+        logger.info(f"Recycling pooled Chrome instance: {reason}")
+        pooled.quit()
+        with self._lock:
+            self._all.discard(pooled)
+            self.recycled += 1
+
+    def _take(self):
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                return self._launch()
+            if pooled.is_healthy():
+                return pooled
+            self._discard(pooled, 'failed health check')
+
+    @contextmanager
+    def borrow(self, timeout=BROWSER_BORROW_TIMEOUT):
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No browser available in pool after {timeout} seconds")
+        pooled = None
+        try:
+            pooled = self._take()
+            pooled.uses += 1
+            with self._lock:
+                self.borrowed += 1
+            pooled.open_tab()
+            yield pooled
+        except GeneratorExit:
+            # Consumatorul unui generator a oprit iterarea - browser-ul rămâne utilizabil
+            raise
+        except BaseException:
+            if pooled:
+                pooled.broken = True
+            raise
+        finally:
+            if pooled:
+                self._return(pooled)
+            self._slots.release()
+
+    def _return(self, pooled):
+        # Memoria se măsoară înainte de închiderea tab-ului; după aceea rămâne doar tab-ul gol de bază
+        memory_exceeded = not pooled.broken and pooled.uses < BROWSER_MAX_USES and pooled.memory_exceeded()
+        try:
+            pooled.close_tab()
+        except Exception:
+            pooled.broken = True
+        if pooled.broken:
+            self._discard(pooled, 'error during use')
+        elif pooled.uses >= BROWSER_MAX_USES:
+            self._discard(pooled, f'reached {pooled.uses} uses')
+        elif memory_exceeded:
+            self._discard(pooled, 'memory growth')
+        else:
+            self._idle.put(pooled)
+
+    def close_all(self):
+        with self._lock:
+            drivers = list(self._all)
+            self._all.clear()
+        for pooled in drivers:
+            pooled.quit()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'open': len(self._all),
+                'idle': self._idle.qsize(),
+                'launched': self.launched,
+                'recycled': self.recycled,
+                'borrowed': self.borrowed
+            }
+
+browser_pool = ChromeDriverPool(BROWSER_POOL_SIZE)
+
+class TwitterQueryExecutor:
+    """
+    Rulează mai multe căutări Twitter în paralel, coordonat:
+    - Numărul de căutări simultane este limitat de worker-i, de pool-ul de browsere
+      și de concurența permisă fiecărui cont
+    - Fiecare căutare primește contul cel mai puțin ocupat și respectă bucket-ul lui de rată
+    - Rezultatele sunt returnate pe măsură ce fiecare query se termină
+    """
+    def __init__(self, accounts, max_workers):
+        self._accounts = accounts
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='twitter-query')
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+
+    def _run(self, search_query, kwargs):
+        with self._accounts.acquire() as account:
+            logger.info(f"Running Twitter query {search_query!r} as {account.name}")
+            return scrape_twitter(search_query, account=account, **kwargs)
+
+    def submit(self, search_query, **kwargs):
+        return self._executor.submit(self._run, search_query, kwargs)
+
+    def run(self, queries, **kwargs):
+        """Generator (query, rezultate) în ordinea terminării căutărilor"""
+        futures = {self.submit(query, **kwargs): query for query in dict.fromkeys(queries)}
+        for future in as_completed(futures):
+            search_query = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.error(f"Twitter query {search_query!r} failed: {e}")
+                results = []
+            with self._lock:
+                if results:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            yield search_query, results
+
+    def stats(self):
+        with self._lock:
+            return {
+                'completed': self.completed,
+                'failed': self.failed,
+                'accounts': self._accounts.stats()
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+twitter_executor = TwitterQueryExecutor(twitter_accounts, TWITTER_BATCH_WORKERS)
+
+def scrape_twitter(search_query, extraction_mode=None, backend=None, account=None, since=None):
+    """
+    Extrage rezultate de pe Twitter folosind Selenium:
+    - Folosește un browser din pool-ul partajat, în loc să pornească unul nou
+    - Gestionează autentificarea (dacă este necesară)
+    - Procesează rezultatele paginii
+    - Extrage metricile pentru fiecare tweet
+    - Gestionează diferite selectors pentru robustețe
+    extraction_mode: 'batch' (un singur execute_script) sau 'elements' (find_element per câmp)
+    backend: 'dom' (extragere din pagină) sau 'network' (răspunsurile JSON capturate prin DevTools);
+             'network' necesită TWITTER_NETWORK_CAPTURE, altfel apelul este respins cu ValueError
+    account: contul Twitter deja rezervat de apelant; implicit se rezervă din twitter_accounts
+             contul cel mai puțin ocupat, astfel încât limita de concurență per cont se aplică oricărui apel
+    since: marcajul din marcaj_twitter - se returnează doar tweet-urile publicate după ultima căutare salvată
+    """
+    extraction_mode = extraction_mode or TWITTER_EXTRACTION_MODE
+    backend = backend or TWITTER_SCRAPE_BACKEND
+    if backend == 'network' and not TWITTER_NETWORK_CAPTURE:
+        # Browserele din pool nu au jurnalul performance - captura ar eșua și ar reveni tacit la DOM
+        raise ValueError("backend='network' requires TWITTER_NETWORK_CAPTURE = True")
+    if account is None:
+        with twitter_accounts.acquire() as account:
+            return scrape_twitter(search_query, extraction_mode, backend, account, since)
+    try:
+        with browser_pool.borrow() as pooled:
+            results = []
+            if backend == 'network':
+                results = _scrape_twitter_retea(pooled, search_query, account, since)
+                if not results:
+                    logger.info("Network capture returned no tweets, falling back to DOM extraction")
+            if not results:
+                results = _scrape_twitter_cu_driver(pooled, search_query, extraction_mode, account, since)
+        if since:
+            new_results = [tweet for tweet in results if not tweet_deja_salvat(tweet, since)]
+            logger.info(f"{len(new_results)} of {len(results)} tweets are newer than the last stored search")
+            return new_results
+        return results
+    except Exception as e:
+        logger.error(f"Error in Twitter scraping: {str(e)}")
+        return []
+
+def parseaza_data_tweet(value):
+    """
+    Convertește data publicării unui tweet în datetime local (fără fus orar):
+    - atributul datetime din <time> ('2024-05-01T12:34:56.000Z')
+    - created_at din API ('Wed Oct 10 20:19:24 +0000 2018')
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = datetime.strptime(value, '%a %b %d %H:%M:%S %z %Y')
+        except ValueError:
+            return None
+    return parsed.astimezone().replace(tzinfo=None)
+
+def _data_ora_tweet(posted):
+    """(dată, oră) de stocat pentru tweet; momentul curent doar dacă data lipsește din pagină"""
+    posted = posted or datetime.now()
+    return posted.date(), posted.time()
+
+def _metrica_din_aria(value_text):
+    """Extrage valoarea numerică din aria-label-ul unui buton de metrică (ex. '1,234 Likes. Like')"""
+    return int(''.join(filter(str.isdigit, value_text)) or 0)
+
+def extrage_tweeturi_elemente(found_tweets, url, limit=TWITTER_MAX_TWEETS):
+    """Extrage tweet-urile element cu element, cu apeluri WebDriver separate pentru fiecare câmp"""
+    results = []
+    for tweet in found_tweets[:limit]:
+        try:
+            username = None
+            content = None
+            tweet_link = url
+            posted = None
+            
+            # Try multiple selectors for username
+            username_selectors = [
+                '[data-testid="User-Name"]',
+                '.css-1rynq56',
+                'span[class*="username"]'
+            ]
+            for selector in username_selectors:
+                try:
+                    username_elem = tweet.find_element(By.CSS_SELECTOR, selector)
+                    username = username_elem.text
+                    if username:
+                        break
+                except:
+                    continue
+                
+            # Try multiple selectors for content
+            content_selectors = [
+                '[data-testid="tweetText"]',
+                '.css-1qaijid',
+                'div[lang]'
+            ]
+            for selector in content_selectors:
+                try:
+                    content_elem = tweet.find_element(By.CSS_SELECTOR, selector)
+                    content = content_elem.text
+                    if content:
+                        break
+                except:
+                    continue
+                
+            # Try to get tweet link
+            try:
+                time_element = tweet.find_element(By.CSS_SELECTOR, 'time')
+                posted = parseaza_data_tweet(time_element.get_attribute('datetime'))
+                parent = time_element.find_element(By.XPATH, './..')
+                tweet_link = parent.get_attribute('href')
+            except:
+                logger.debug("Could not get tweet link, using search URL")
+                
+            # Add metrics extraction
+            metrics = {
+                'replies': 0,
+                'reposts': 0,
+                'likes': 0
+            }
+            
+            try:
+                # Try to find metrics elements
+                metrics_selectors = {
+                    'replies': '[data-testid="reply"]',
+                    'reposts': '[data-testid="retweet"]',
+                    'likes': '[data-testid="like"]'
+                }
+                
+                for metric, selector in metrics_selectors.items():
+                    try:
+                        element = tweet.find_element(By.CSS_SELECTOR, selector)
+                        value_text = element.get_attribute('aria-label')
+                        if value_text:
+                            metrics[metric] = _metrica_din_aria(value_text)
+                    except:
+                        continue
+                
+            except Exception as e:
+                logger.warning(f"Error extracting metrics: {str(e)}")
+            
+            if username and content:
+                logger.debug(f"Found tweet from {username}")
+                tweet_date, tweet_time = _data_ora_tweet(posted)
+                results.append({
+                    'username': username,
+                    'content': content,
+                    'link': tweet_link,
+                    'metrics': metrics,
+                    'date': tweet_date,
+                    'time': tweet_time
+                })
+        except Exception as e:
+            logger.error(f"Error processing tweet: {str(e)}")
+            continue
+    
+    return results
+
+_BATCH_EXTRACTION_SCRIPT = """
+    var selector = arguments[0];
+    var limit = arguments[1];
+    var incremental = arguments[2];
+    var containers = document.querySelectorAll(incremental ? selector + ':not([data-osint-seen])' : selector);
+    var usernameSelectors = ['[data-testid="User-Name"]', '.css-1rynq56', 'span[class*="username"]'];
+    var contentSelectors = ['[data-testid="tweetText"]', '.css-1qaijid', 'div[lang]'];
+    function firstText(root, selectors) {
+        for (var i = 0; i < selectors.length; i++) {
+            var element = root.querySelector(selectors[i]);
+            if (element && element.innerText) { return element.innerText; }
+        }
+        return null;
+    }
+    function ariaLabel(root, selector) {
+        var element = root.querySelector(selector);
+        return element ? element.getAttribute('aria-label') : null;
+    }
+    var tweets = [];
+    for (var i = 0; i < containers.length && i < limit; i++) {
+        var tweet = containers[i];
+        var timeElement = tweet.querySelector('time');
+        var linkElement = timeElement ? timeElement.parentElement : null;
+        var data = {
+            username: firstText(tweet, usernameSelectors),
+            content: firstText(tweet, contentSelectors),
+            link: linkElement && linkElement.href ? linkElement.href : null,
+            datetime: timeElement ? timeElement.getAttribute('datetime') : null,
+            replies: ariaLabel(tweet, '[data-testid="reply"]'),
+            reposts: ariaLabel(tweet, '[data-testid="retweet"]'),
+            likes: ariaLabel(tweet, '[data-testid="like"]')
+        };
+        tweets.push(data);
+        if (incremental) {
+            // Marcăm orice container procesat (și cele fără text, ex. doar media), ca să nu mai
+            // corespundă selectorului de noduri noi, și eliberăm media grea din nodurile deja citite
+            tweet.setAttribute('data-osint-seen', '1');
+            var media = tweet.querySelectorAll('img, video');
+            for (var j = 0; j < media.length; j++) { media[j].removeAttribute('src'); }
+        }
+    }
+    if (incremental) {
+        window.scrollBy(0, window.innerHeight * 2);
+    }
+    return JSON.stringify(tweets);
+"""
+
+def _tweet_din_raw(raw, url):
+    """Convertește un tweet extras în JavaScript în formatul folosit de aplicație"""
+    if not (raw.get('username') and raw.get('content')):
+        return None
+    tweet_date, tweet_time = _data_ora_tweet(parseaza_data_tweet(raw.get('datetime')))
+    return {
+        'username': raw['username'],
+        'content': raw['content'],
+        'link': raw.get('link') or url,
+        'metrics': {
+            metric: _metrica_din_aria(raw[metric]) if raw.get(metric) else 0
+            for metric in ('replies', 'reposts', 'likes')
+        },
+        'date': tweet_date,
+        'time': tweet_time
+    }
+
+def extrage_tweeturi_batch(driver, selector, url, limit=TWITTER_MAX_TWEETS):
+    """
+    Extrage toate tweet-urile vizibile printr-un singur execute_script,
+    în loc de zeci de apeluri find_element (câte un round trip către chromedriver fiecare).
+    """
+    raw_tweets = json.loads(driver.execute_script(_BATCH_EXTRACTION_SCRIPT, selector, limit, False) or '[]')
+    results = [tweet for tweet in (_tweet_din_raw(raw, url) for raw in raw_tweets) if tweet]
+    logger.debug(f"Batch-extracted {len(results)} tweets from {len(raw_tweets)} elements")
+    return results
+
+def colecteaza_tweeturi_scroll(driver, selector, url, target_count=TWITTER_SCROLL_TARGET,
+                               time_budget=TWITTER_SCROLL_TIME_BUDGET, since=None):
+    """
+    Colector streaming pentru timeline-ul live: derulează pagina până la target_count tweet-uri
+    sau până la epuizarea time_budget, și produce tweet-urile pe măsură ce apar.
+    - De-duplicare incrementală după link-ul tweet-ului
+    - Nodurile DOM deja procesate sunt marcate și golite de media, iar Python
+      păstrează doar mulțimea link-urilor văzute
+    - Extragerea și derularea se fac într-un singur execute_script per pas
+    - Cu since (marcajul din marcaj_twitter), colectarea se oprește la primul tweet deja salvat
+    """
+    seen_links = set()
+    deadline = time.monotonic() + time_budget
+    idle_rounds = 0
+    pending_selector = selector + ':not([data-osint-seen])'
+
+    while len(seen_links) < target_count and time.monotonic() < deadline:
+        raw_tweets = json.loads(driver.execute_script(
+            _BATCH_EXTRACTION_SCRIPT, selector, TWITTER_SCROLL_STEP, True) or '[]')
+        new_tweets = 0
+        for raw in raw_tweets:
+            tweet = _tweet_din_raw(raw, url)
+            if not tweet or tweet['link'] in seen_links:
+                continue
+            if tweet_deja_salvat(tweet, since):
+                # Timeline-ul live este cronologic - de aici încolo totul este deja salvat
+                logger.info(f"Reached already stored tweets after {len(seen_links)} new tweets")
+                return
+            seen_links.add(tweet['link'])
+            new_tweets += 1
+            yield tweet
+            if len(seen_links) >= target_count:
+                return
+
+        idle_rounds = 0 if new_tweets else idle_rounds + 1
+        if idle_rounds >= TWITTER_SCROLL_MAX_IDLE:
+            logger.info(f"No new tweets after {idle_rounds} scrolls, stopping at {len(seen_links)} tweets")
+            return
+        try:
+            # Așteptăm să apară noduri neprocesate după derulare
+            waiter.until(driver, 'scroll_new_content',
+                         lambda d: d.find_elements(By.CSS_SELECTOR, pending_selector),
+                         timeout=min(WAIT_MAX_TIMEOUT, max(0.1, deadline - time.monotonic())))
+        except TimeoutException:
+            continue
+
+def marcaj_twitter(search_query):
+    """
+    Marcajul (high-water mark) al ultimei căutări salvate pentru query:
+    id-ul căutării, cel mai recent moment de publicare stocat și link-urile tweet-urilor ei.
+    Returnează None dacă query-ul nu a mai fost căutat.
+    """
+    previous = execute_db_query("""
+        SELECT search_id FROM twitter_searches
+        WHERE query_hash = %s
+        ORDER BY search_id DESC LIMIT 1
+    """, (amprenta_query(search_query),))
+    if not previous:
+        return None
+    search_id = previous[0]['search_id']
+    rows = execute_db_query("""
+        SELECT tweet_link, tweet_date, tweet_time FROM twitter_results
+        WHERE search_id = %s
+    """, (search_id,))
+    if not rows:
+        return None
+    posted = [datetime.combine(row['tweet_date'], datetime.min.time()) + row['tweet_time']
+              for row in rows if row['tweet_date'] is not None and row['tweet_time'] is not None]
+    return {
+        'search_id': search_id,
+        'posted': max(posted) if posted else None,
+        'links': {row['tweet_link'] for row in rows}
+    }
+
+def tweet_deja_salvat(tweet, since):
+    """Un tweet este deja salvat dacă link-ul lui e cunoscut sau a fost publicat până la marcaj"""
+    if not since:
+        return False
+    if tweet['link'] in since['links']:
+        return True
+    if since['posted'] and tweet.get('date') and tweet.get('time'):
+        return datetime.combine(tweet['date'], tweet['time']) <= since['posted']
+    return False
+
+def url_cautare_twitter(search_query, since=None):
+    """URL-ul căutării live; cu marcaj, adaugă operatorul since_time ca Twitter să nu mai returneze tweet-uri vechi"""
+    if since and since['posted'] and not re.search(r'\bsince(_time)?:', search_query):
+        search_query = f"{search_query} since_time:{int(since['posted'].timestamp())}"
+    encoded_query = requests.utils.quote(search_query)
+    return f"https://twitter.com/search?q={encoded_query}&src=typed_query&f=live"
+
+TWEET_SELECTORS = [
+    'article[data-testid="tweet"]',
+    'div[data-testid="cellInnerDiv"]',
+    'div[data-testid="tweetText"]'
+]
+
+def _deschide_cautare_twitter(pooled, search_query, account=None, since=None):
+    """Asigură autentificarea și deschide pagina de căutare live; returnează URL-ul căutării"""
+    driver = pooled.driver
+    account = account or twitter_accounts.default
+
+    if pooled.account is not account:
+        # Browser-ul are cookie-urile altui cont - le eliminăm înainte de a schimba contul
+        if pooled.logged_in:
+            sterge_cookieuri_browser(driver)
+        pooled.logged_in = False
+        pooled.account = account
+
+    # First, handle login (sesiunea salvată este refolosită dacă e încă validă)
+    if not pooled.logged_in:
+        if not asigura_sesiune_twitter(driver, account):
+            rate_limiter.report_error(account.rate_source)
+            raise Exception("Failed to login to Twitter")
+        pooled.logged_in = True
+        
+    # After successful login, perform search
+    url = url_cautare_twitter(search_query, since)
     
-    driver = None
+    logger.info(f"Accessing Twitter URL: {url}")
+    rate_limiter.acquire(account.rate_source)
+    driver.get(url)
+    if sesiune_expirata(driver):
+        # Cookie-urile au expirat pe server - ne autentificăm din nou o singură dată
+        logger.info("Saved Twitter session expired, logging in again")
+        sterge_sesiune_twitter(driver, account)
+        if not asigura_sesiune_twitter(driver, account):
+            pooled.logged_in = False
+            rate_limiter.report_error(account.rate_source)
+            raise Exception("Failed to login to Twitter")
+        rate_limiter.acquire(account.rate_source)
+        driver.get(url)
+    return url
+
+def scrape_twitter_stream(search_query, target_count=TWITTER_SCROLL_TARGET, time_budget=TWITTER_SCROLL_TIME_BUDGET,
+                          since=None, account=None):
+    """
+    Variantă streaming a scrape_twitter: derulează timeline-ul live și produce tweet-urile
+    pe măsură ce sunt găsite, până la target_count, time_budget secunde sau primul tweet deja salvat.
+    Fără account, rezervă un cont din twitter_accounts pe toată durata colectării.
+    """
+    if account is None:
+        with twitter_accounts.acquire() as account:
+            yield from scrape_twitter_stream(search_query, target_count, time_budget, since, account)
+        return
+
+    with browser_pool.borrow() as pooled:
+        driver = pooled.driver
+        url = _deschide_cautare_twitter(pooled, search_query, account, since)
+        try:
+            selector, _ = waiter.until(driver, 'search_results', oricare_selector(TWEET_SELECTORS))
+        except TimeoutException:
+            logger.warning(f"No tweets found for streaming query: {search_query}")
+            rate_limiter.report_error(pooled.account.rate_source)
+            return
+        count = 0
+        for tweet in colecteaza_tweeturi_scroll(driver, selector, url, target_count, time_budget, since):
+            count += 1
+            yield tweet
+        rate_limiter.report_success(pooled.account.rate_source)
+        logger.info(f"Streamed {count} tweets for query: {search_query}")
+
+def captureaza_raspunsuri_cautare(driver):
+    """
+    Citește jurnalul de performanță DevTools și returnează corpurile JSON ale răspunsurilor
+    SearchTimeline descărcate deja de pagina de căutare.
+    """
+    pending = set()
+    bodies = []
+
+    def condition(d):
+        for entry in d.get_log('performance'):
+            message = json.loads(entry['message']).get('message', {})
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.responseReceived':
+                if TWITTER_SEARCH_API_MARKER in params.get('response', {}).get('url', ''):
+                    pending.add(params['requestId'])
+            elif method == 'Network.loadingFinished' and params.get('requestId') in pending:
+                pending.discard(params['requestId'])
+                try:
+                    body = d.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})
+                    bodies.append(body['body'])
+                except Exception as e:
+                    logger.debug(f"Could not read captured response body: {e}")
+        return bodies or False
+
+    return waiter.until(driver, 'network_search_response', condition)
+
+def parseaza_tweeturi_api(payload):
+    """
+    Extrage tweet-urile dintr-un răspuns SearchTimeline (GraphQL):
+    text complet, autor, link, dată exactă și contoarele exacte de engagement.
+    """
+    tweets = []
+    timeline = (payload.get('data', {}).get('search_by_raw_query', {})
+                .get('search_timeline', {}).get('timeline', {}))
+    for instruction in timeline.get('instructions', []):
+        entries = instruction.get('entries', [])
+        if instruction.get('entry'):
+            entries = entries + [instruction['entry']]
+        for entry in entries:
+            content = entry.get('content', {})
+            items = [content] + [item.get('item', {}) for item in content.get('items', [])]
+            for item in items:
+                result = item.get('itemContent', {}).get('tweet_results', {}).get('result', {})
+                if result.get('__typename') == 'TweetWithVisibilityResults':
+                    result = result.get('tweet', {})
+                legacy = result.get('legacy')
+                if not legacy:
+                    continue
+                user = result.get('core', {}).get('user_results', {}).get('result', {})
+                screen_name = (user.get('core', {}).get('screen_name')
+                               or user.get('legacy', {}).get('screen_name'))
+                if not screen_name:
+                    continue
+                note = result.get('note_tweet', {}).get('note_tweet_results', {}).get('result', {})
+                tweet_date, tweet_time = _data_ora_tweet(parseaza_data_tweet(legacy.get('created_at')))
+                tweets.append({
+                    'username': f"@{screen_name}",
+                    'content': note.get('text') or legacy.get('full_text', ''),
+                    'link': f"https://x.com/{screen_name}/status/{legacy.get('id_str') or result.get('rest_id')}",
+                    'metrics': {
+                        'replies': legacy.get('reply_count', 0),
+                        'reposts': legacy.get('retweet_count', 0),
+                        'likes': legacy.get('favorite_count', 0),
+                        'bookmarks': legacy.get('bookmark_count', 0)
+                    },
+                    'date': tweet_date,
+                    'time': tweet_time
+                })
+    return tweets
+
+def _scrape_twitter_retea(pooled, search_query, account=None, since=None, limit=TWITTER_MAX_TWEETS):
+    """Backend 'network': tweet-urile sunt citite din răspunsurile JSON capturate, nu din DOM"""
+    driver = pooled.driver
+    try:
+        # Golim jurnalul rămas de la utilizările anterioare ale browser-ului
+        driver.get_log('performance')
+        _deschide_cautare_twitter(pooled, search_query, account, since)
+        bodies = captureaza_raspunsuri_cautare(driver)
+    except TimeoutException:
+        logger.warning("No SearchTimeline response captured")
+        return []
+    except Exception as e:
+        logger.warning(f"Network capture backend unavailable: {e}")
+        return []
+
+    results = []
+    seen_links = set()
+    for body in bodies:
+        try:
+            for tweet in parseaza_tweeturi_api(json.loads(body)):
+                if tweet['link'] not in seen_links:
+                    seen_links.add(tweet['link'])
+                    results.append(tweet)
+        except ValueError as e:
+            logger.debug(f"Skipping non-JSON captured response: {e}")
+    if results:
+        rate_limiter.report_success(pooled.account.rate_source)
+        logger.info(f"Captured {len(results)} tweets from network responses")
+    return results[:limit]
+
+def _scrape_twitter_cu_driver(pooled, search_query, extraction_mode, account=None, since=None):
+    """Rulează căutarea Twitter în tab-ul curent al unui browser din pool"""
+    driver = pooled.driver
     max_retries = 3
     retry_count = 0
     
     try:
-        driver = webdriver.Chrome(options=chrome_options)
-        
-        # First, handle login
-        if not login_to_twitter(driver):
-            raise Exception("Failed to login to Twitter")
-            
-        # After successful login, perform search
-        encoded_query = requests.utils.quote(search_query)
-        url = f"https://twitter.com/search?q={encoded_query}&src=typed_query&f=live"
-        
-        print(f"Accessing Twitter URL: {url}")
-        driver.get(url)
-        time.sleep(5)  # Wait for search results to load
+        url = _deschide_cautare_twitter(pooled, search_query, account, since)
         
         while retry_count < max_retries:
             try:
-                found_tweets = None
                 # Wait for any of these selectors to be present
-                selectors = [
-                    'article[data-testid="tweet"]',
-                    'div[data-testid="cellInnerDiv"]',
-                    'div[data-testid="tweetText"]'
-                ]
+                selectors = TWEET_SELECTORS
                 
-                for selector in selectors:
+                try:
+                    # O singură așteptare pentru toți selectorii, urmată de stabilizarea DOM-ului
+                    selector, _ = waiter.until(driver, 'search_results', oricare_selector(selectors))
+                except TimeoutException as e:
+                    logger.warning(f"No tweet selector matched: {str(e)}")
+                    selector = None
+                else:
                     try:
-                        print(f"Trying selector: {selector}")
-                        wait = WebDriverWait(driver, 10)
-                        elements = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector)))
-                        if elements and len(elements) > 0:
-                            found_tweets = elements
-                            print(f"Found {len(elements)} tweets with selector: {selector}")
-                            break
-                    except Exception as e:
-                        print(f"Selector {selector} failed: {str(e)}")
-                        continue
+                        waiter.until(driver, 'search_dom_stable', dom_stabil())
+                    except TimeoutException:
+                        logger.debug("DOM still changing, extracting what is present")
                 
-                if not found_tweets:
-                    print("No tweets found with any selector")
+                if not selector:
+                    logger.warning("No tweets found with any selector")
                     raise Exception("No tweet elements found")
                 
-                results = []
-                for tweet in found_tweets[:10]:
-                    try:
-                        username = None
-                        content = None
-                        tweet_link = url
-                        
-                        # Try multiple selectors for username
-                        username_selectors = [
-                            '[data-testid="User-Name"]',
-                            '.css-1rynq56',
-                            'span[class*="username"]'
-                        ]
-                        for selector in username_selectors:
-                            try:
-                                username_elem = tweet.find_element(By.CSS_SELECTOR, selector)
-                                username = username_elem.text
-                                if username:
-                                    break
-                            except:
-                                continue
-                            
-                        # Try multiple selectors for content
-                        content_selectors = [
-                            '[data-testid="tweetText"]',
-                            '.css-1qaijid',
-                            'div[lang]'
-                        ]
-                        for selector in content_selectors:
-                            try:
-                                content_elem = tweet.find_element(By.CSS_SELECTOR, selector)
-                                content = content_elem.text
-                                if content:
-                                    break
-                            except:
-                                continue
-                            
-                        # Try to get tweet link
-                        try:
-                            time_element = tweet.find_element(By.CSS_SELECTOR, 'time')
-                            parent = time_element.find_element(By.XPATH, './..')
-                            tweet_link = parent.get_attribute('href')
-                        except:
-                            print("Could not get tweet link, using search URL")
-                            
-                        # Add metrics extraction
-                        metrics = {
-                            'replies': 0,
-                            'reposts': 0,
-                            'likes': 0
-                        }
-                        
-                        try:
-                            # Try to find metrics elements
-                            metrics_selectors = {
-                                'replies': '[data-testid="reply"]',
-                                'reposts': '[data-testid="retweet"]',
-                                'likes': '[data-testid="like"]'
-                            }
-                            
-                            for metric, selector in metrics_selectors.items():
-                                try:
-                                    element = tweet.find_element(By.CSS_SELECTOR, selector)
-                                    value_text = element.get_attribute('aria-label')
-                                    if value_text:
-                                        metrics[metric] = int(''.join(filter(str.isdigit, value_text)) or 0)
-                                except:
-                                    continue
-                            
-                        except Exception as e:
-                            print(f"Error extracting metrics: {str(e)}")
-                        
-                        if username and content:
-                            print(f"Found tweet from {username}")
-                            results.append({
-                                'username': username,
-                                'content': content,
-                                'link': tweet_link,
-                                'metrics': metrics,
-                                'date': datetime.now().date(),  # Should be extracted from tweet
-                                'time': datetime.now().time()   # Should be extracted from tweet
-                            })
-                    except Exception as e:
-                        print(f"Error processing tweet: {str(e)}")
-                        continue
+                if extraction_mode == 'batch':
+                    results = extrage_tweeturi_batch(driver, selector, url)
+                else:
+                    found_tweets = driver.find_elements(By.CSS_SELECTOR, selector)
+                    logger.info(f"Found {len(found_tweets)} tweets with selector: {selector}")
+                    results = extrage_tweeturi_elemente(found_tweets, url)
                 
                 if results:
-                    print(f"Successfully found {len(results)} tweets")
+                    logger.info(f"Successfully found {len(results)} tweets")
+                    rate_limiter.report_success(pooled.account.rate_source)
                     return results
                     
-                print(f"No valid tweets found in attempt {retry_count + 1}")
+                logger.warning(f"No valid tweets found in attempt {retry_count + 1}")
                 retry_count += 1
-                time.sleep(3)  # Increased wait between retries
+                asteapta_inainte_de_reincercare(driver)
                 
             except Exception as e:
-                print(f"Attempt {retry_count + 1} failed: {str(e)}")
+                logger.warning(f"Attempt {retry_count + 1} failed: {str(e)}")
                 screenshot_path = f'twitter_error_{retry_count}.png'
                 driver.save_screenshot(screenshot_path)
-                print(f"Screenshot saved to {screenshot_path}")
+                logger.info(f"Screenshot saved to {screenshot_path}")
                 retry_count += 1
-                time.sleep(3)  # Increased wait between retries
+                asteapta_inainte_de_reincercare(driver)
                 
-        print("All retry attempts failed")
+        logger.error("All retry attempts failed")
+        rate_limiter.report_error(pooled.account.rate_source)
         return []
             
     except Exception as e:
-        print(f"Error in Twitter scraping: {str(e)}")
+        logger.error(f"Error in Twitter scraping: {str(e)}")
         if driver:
             driver.save_screenshot('twitter_error_final.png')
+        pooled.broken = True
         return []
-        
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
 
 @app.route('/')
 def index():
@@ -679,25 +2543,115 @@ def index():
     # Afișează pagina principală folosind template-ul 'index.html'
     return render_template('index.html')
 
-def perform_google_search(search_query, max_retries=3):
+class SearchResultCache:
+    """
+    Cache în memorie pentru rezultatele perform_google_search, cu coalescență single-flight:
+    - Cheia este (query normalizat, limbă, număr de rezultate)
+    - Rezultatele sunt păstrate GOOGLE_CACHE_TTL secunde
+    - Cererile identice simultane așteaptă un singur apel către Google
+    """
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._in_flight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def make_key(search_query, lang, num_results):
+        # Nu schimbăm literele: operatorii Google (OR, AND) depind de majuscule
+        return (' '.join(search_query.split()), lang, num_results)
+
+    def get_or_fetch(self, key, fetch):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[0] < self.ttl:
+                self.hits += 1
+                return entry[1]
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                self.misses += 1
+                flight = {'event': threading.Event(), 'result': None, 'error': None}
+                self._in_flight[key] = flight
+            else:
+                self.coalesced += 1
+        if not leader:
+            # Așteptăm rezultatul apelului deja în desfășurare
+            flight['event'].wait()
+            if flight['error'] is not None:
+                raise flight['error']
+            return flight['result']
+
+        try:
+            flight['result'] = fetch()
+            if flight['result']:
+                with self._lock:
+                    self._entries[key] = (time.monotonic(), flight['result'])
+            return flight['result']
+        except Exception as e:
+            flight['error'] = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+                self._purge_expired()
+            flight['event'].set()
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        for key in [k for k, (ts, _) in self._entries.items() if now - ts >= self.ttl]:
+            del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'entries': len(self._entries),
+                'hit_ratio': round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0
+            }
+
+google_search_cache = SearchResultCache(GOOGLE_CACHE_TTL)
+
+def perform_google_search(search_query, max_retries=3, lang='ro', num_results=10, use_cache=True):
     """
     Execută căutarea pe Google cu:
+    - Cache cu TTL și coalescența cererilor identice simultane
     - Reîncercări automate în caz de eșec
     - Validarea și procesarea rezultatelor
     - Logging detaliat al erorilor
     """
+    def fetch():
+        return _perform_google_search_upstream(search_query, max_retries, lang, num_results)
+
+    if not use_cache:
+        return fetch()
+    key = SearchResultCache.make_key(search_query, lang, num_results)
+    return google_search_cache.get_or_fetch(key, fetch)
+
+def _perform_google_search_upstream(search_query, max_retries, lang, num_results):
+    """Apelul efectiv către Google, fără cache"""
     logger.info(f"Attempting Google search for query: {search_query}")
     
     for attempt in range(max_retries):
         try:
+            # Așteptăm un token de la limitatorul global în loc de pauze fixe
+            rate_limiter.acquire('google')
             # The search() function only accepts positional arguments, not keyword arguments
             results = list(search(
                 search_query,     # The search query string
-                num_results=10,   # Number of results to return
-                lang="ro",        # Language setting
+                num_results=num_results,   # Number of results to return
+                lang=lang,        # Language setting
                 advanced=True     # Enable advanced search features
             ))
             
+            rate_limiter.report_success('google')
+            
             # Validate results
             if results:
                 logger.info(f"Search successful, found {len(results)} results")
@@ -709,15 +2663,15 @@ def perform_google_search(search_query, max_retries=3):
                     
         except URLError as e:
             logger.error(f"URLError on attempt {attempt + 1}: {e}")
+            rate_limiter.report_error('google')
             if attempt == max_retries - 1:
                 raise
-            time.sleep(2 ** attempt)
             
         except Exception as e:
             logger.error(f"Search error on attempt {attempt + 1}: {str(e)}")
+            rate_limiter.report_error('google')
             if attempt == max_retries - 1:
                 raise
-            time.sleep(2 ** attempt)
     
     return []
 
@@ -733,6 +2687,7 @@ def cauta_toti_sursele():
     try:
         keyword = request.form.get('keyword', '').strip()
         search_query = request.form.get('query', '').strip()
+        deep = request.form.get('deep') == 'true'
         
         if not search_query and keyword:
             search_query = keyword
@@ -740,6 +2695,11 @@ def cauta_toti_sursele():
             logger.warning("No search query provided")
             return render_template('index.html', error="Please enter a search term or use operators")
 
+        if request.form.get('async') == 'true':
+            num_results = int(request.form.get('num_results', 10))
+            job = search_jobs.submit('google', search_query, pipeline_google, deep=deep, num_results=num_results)
+            return jsonify({'job_id': job.job_id, 'events': url_for('search_job_events', job_id=job.job_id)}), 202
+
         logger.info(f"Processing search request with query: {search_query}")
         
         try:
@@ -753,19 +2713,7 @@ def cauta_toti_sursele():
                                     search_query=search_query)
 
             # Process results
-            results_with_info = []
-            for result in search_results:
-                try:
-                    title, description, _ = extrage_info_pagina(result)
-                    results_with_info.append({
-                        'link': result.url if hasattr(result, 'url') else str(result),
-                        'title': title,
-                        'description': description
-                    })
-                    logger.debug(f"Processed result: {title}")
-                except Exception as e:
-                    logger.error(f"Error processing result: {str(e)}")
-                    continue
+            results_with_info = imbogateste_rezultate(search_results, deep=deep)
 
             # Save results to database if we have any
             if results_with_info:
@@ -787,6 +2735,235 @@ def cauta_toti_sursele():
         return render_template('index.html', 
                             error="An unexpected error occurred. Please try again.")
 
+@app.route('/search_paginated', methods=['POST'])
+def search_paginated():
+    """
+    Pornește o colectare Google paginată (peste 10 rezultate) în fundal, prin search_jobs.
+    Returnează imediat search_id și job_id; rezultatele apar în /get_search_details
+    pe măsură ce fiecare lot este salvat.
+    """
+    try:
+        search_query = (request.form.get('query') or request.form.get('keyword') or '').strip()
+        if not search_query:
+            return jsonify({'error': 'Please enter a search term or use operators'}), 400
+        num_results = min(int(request.form.get('num_results', GOOGLE_STREAM_MAX_RESULTS)), GOOGLE_STREAM_MAX_RESULTS)
+        deep = request.form.get('deep') == 'true'
+
+        connection = DatabaseConnectionManager().get_connection()
+        cursor = connection.cursor()
+        try:
+            search_id, _, _ = insereaza_cautare_google(cursor, search_query)
+            connection.commit()
+        finally:
+            cursor.close()
+            connection.close()
+
+        job = search_jobs.submit('google', search_query, pipeline_google_paginat,
+                                 search_id=search_id, deep=deep, num_results=num_results)
+        return jsonify({'status': 'started', 'search_id': search_id, 'job_id': job.job_id})
+
+    except Exception as e:
+        logger.error(f"Error starting paginated search: {e}")
+        return jsonify({'error': str(e)}), 500
+
+class SearchJob:
+    """O căutare rulată în fundal, cu lista de evenimente de progres transmise prin SSE"""
+    def __init__(self, source, search_query):
+        self.job_id = uuid.uuid4().hex
+        self.source = source
+        self.search_query = search_query
+        self.status = 'queued'
+        self.created = time.time()
+        self.finished = None
+        self.events = []
+        self.condition = threading.Condition()
+
+    def emit(self, event, **data):
+        with self.condition:
+            self.events.append((event, data))
+            self.condition.notify_all()
+
+    def finish(self, status, **data):
+        with self.condition:
+            self.status = status
+            self.finished = time.time()
+            self.events.append((status, data))
+            self.condition.notify_all()
+
+    def to_dict(self):
+        with self.condition:
+            return {
+                'job_id': self.job_id,
+                'source': self.source,
+                'query': self.search_query,
+                'status': self.status,
+                'events': len(self.events)
+            }
+
+class SearchJobManager:
+    """
+    Rulează pipeline-urile de căutare (fetch → enrich → save) într-un pool de thread-uri,
+    astfel încât worker-ii Flask sunt eliberați imediat după crearea job-ului.
+    """
+    def __init__(self, max_workers):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='search-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, source, search_query, pipeline, **kwargs):
+        job = SearchJob(source, search_query)
+        with self._lock:
+            self._purge_finished()
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, pipeline, kwargs)
+        logger.info(f"Queued {source} search job {job.job_id} for query: {search_query}")
+        return job
+
+    def _run(self, job, pipeline, kwargs):
+        job.status = 'running'
+        job.emit('stage', stage='started')
+        try:
+            pipeline(job, **kwargs)
+        except Exception as e:
+            logger.error(f"Search job {job.job_id} failed: {e}")
+            job.finish('failed', error=str(e))
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _purge_finished(self):
+        now = time.time()
+        for job_id in [j for j, job in self._jobs.items()
+                       if job.finished and now - job.finished > SEARCH_JOB_RETENTION]:
+            del self._jobs[job_id]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+search_jobs = SearchJobManager(SEARCH_JOB_WORKERS)
+
+def pipeline_google(job, deep=False, num_results=10):
+    """Pipeline Google pentru job-uri asincrone; peste 10 rezultate folosește colectarea paginată"""
+    if num_results > GOOGLE_PAGE_SIZE:
+        job.emit('stage', stage='search')
+        total = 0
+        search_id = None
+        for search_id, batch in colecteaza_google_paginat(job.search_query, num_results=num_results, deep=deep):
+            total += len(batch)
+            job.emit('partial', results=batch, total=total)
+        job.finish('completed', search_id=search_id, total=total)
+        return
+
+    job.emit('stage', stage='search')
+    search_results = perform_google_search(job.search_query)
+    if not search_results:
+        job.finish('completed', total=0)
+        return
+    job.emit('stage', stage='enrich', found=len(search_results))
+    results_with_info = imbogateste_rezultate(search_results, deep=deep)
+    job.emit('partial', results=results_with_info, total=len(results_with_info))
+    job.emit('stage', stage='save')
+    saved = save_google_results(job.search_query, results_with_info)
+    job.finish('completed', total=len(results_with_info), saved=saved)
+
+def pipeline_google_paginat(job, search_id, deep=False, num_results=GOOGLE_STREAM_MAX_RESULTS):
+    """
+    Pipeline pentru /search_paginated: completează o căutare Google deja creată, lot cu lot.
+    Dacă nu se salvează niciun rezultat, căutarea creată dinainte este ștearsă (search_id None).
+    """
+    job.emit('stage', stage='search', search_id=search_id)
+    total = 0
+    for _, batch in colecteaza_google_paginat(job.search_query, num_results=num_results,
+                                              deep=deep, search_id=search_id):
+        total += len(batch)
+        job.emit('partial', results=batch, total=total)
+    job.finish('completed', search_id=search_id if total else None, total=total)
+
+def pipeline_twitter(job, max_tweets=TWITTER_MAX_TWEETS):
+    """Pipeline Twitter pentru job-uri asincrone; peste TWITTER_MAX_TWEETS folosește colectarea prin scroll"""
+    if max_tweets > TWITTER_MAX_TWEETS:
+        job.emit('stage', stage='scrape')
+        total = 0
+        search_id = None
+        for search_id, batch in colecteaza_si_salveaza_twitter(job.search_query, target_count=max_tweets):
+            total += len(batch)
+            job.emit('partial', results=batch, total=total)
+        job.finish('completed', search_id=search_id, total=total)
+        return
+
+    job.emit('stage', stage='scrape')
+    twitter_results = scrape_twitter(job.search_query)
+    if not twitter_results:
+        job.finish('completed', total=0)
+        return
+    job.emit('partial', results=twitter_results, total=len(twitter_results))
+    job.emit('stage', stage='save')
+    saved = save_twitter_results(job.search_query, twitter_results)
+    job.finish('completed', total=len(twitter_results), saved=saved)
+
+def pipeline_twitter_batch(job, queries):
+    """Pipeline pentru un lot de query-uri Twitter; fiecare query este salvat imediat ce se termină"""
+    job.emit('stage', stage='scrape', queries=len(queries))
+    done = 0
+    total = 0
+    for search_query, results in twitter_executor.run(queries):
+        done += 1
+        saved = save_twitter_results(search_query, results) if results else False
+        total += len(results)
+        job.emit('partial', query=search_query, results=results, saved=saved,
+                 done=done, remaining=len(queries) - done)
+    job.finish('completed', queries=done, total=total)
+
+@app.route('/search_twitter_batch', methods=['POST'])
+def search_twitter_batch():
+    """
+    Pornește în fundal un lot de căutări Twitter (câte un query pe linie în 'queries').
+    Progresul și rezultatele fiecărui query sunt disponibile prin /search_jobs/<job_id>/events.
+    """
+    queries = [q.strip() for q in request.form.get('queries', '').splitlines() if q.strip()]
+    queries = list(dict.fromkeys(queries))
+    if not queries:
+        return jsonify({'error': 'Please enter at least one search query'}), 400
+    if len(queries) > TWITTER_BATCH_MAX_QUERIES:
+        return jsonify({'error': f'At most {TWITTER_BATCH_MAX_QUERIES} queries per batch'}), 400
+    job = search_jobs.submit('twitter_batch', ' | '.join(queries), pipeline_twitter_batch, queries=queries)
+    return jsonify({'status': 'queued', 'job_id': job.job_id, 'queries': len(queries)}), 202
+
+@app.route('/search_jobs/<job_id>')
+def search_job_status(job_id):
+    """Starea curentă a unui job de căutare"""
+    job = search_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/search_jobs/<job_id>/events')
+def search_job_events(job_id):
+    """Flux Server-Sent Events cu progresul pe etape și rezultatele parțiale ale unui job"""
+    job = search_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    def event_stream():
+        index = 0
+        while True:
+            with job.condition:
+                if index >= len(job.events) and not job.finished:
+                    job.condition.wait(SSE_KEEPALIVE)
+                pending = job.events[index:]
+                finished = job.finished is not None
+            if not pending and not finished:
+                yield ': keep-alive\n\n'
+            for event, data in pending:
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+            index += len(pending)
+            if finished and index >= len(job.events):
+                break
+
+    return Response(stream_with_context(event_stream()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 def build_twitter_query(form_data):
     """
     Build an advanced Twitter search query from form data
@@ -857,8 +3034,12 @@ def clean_username(username):
         return username_match.group(0)
     return username  # Return original if no match found
 
-def save_twitter_results(search_query, results):
-    """Save Twitter search results with detailed information and update history"""
+def save_twitter_results(search_query, results, since_search_id=None):
+    """
+    Save Twitter search results with detailed information and update history.
+    since_search_id: marcajul căutării incrementale - căutarea anterioară pe care o continuă,
+    când results conține doar tweet-urile noi; tweet-urile ei nu sunt copiate, ci citite prin lanț
+    """
     if not results:
         return False
         
@@ -875,76 +3056,14 @@ def save_twitter_results(search_query, results):
             connection.start_transaction()
             
             # Save search query
-            search_insert_query = """
-                INSERT INTO twitter_searches (search_query, search_date, search_time)
-                VALUES (%s, %s, %s)
-            """
-            current_date = datetime.now().date()
-            current_time = datetime.now().time()
-            
-            cursor.execute(search_insert_query, (search_query, current_date, current_time))
-            current_search_id = cursor.lastrowid
-            
-            # Get previous searches for this query
-            cursor.execute("""
-                SELECT search_id, search_date, search_time 
-                FROM twitter_searches 
-                WHERE search_query = %s AND search_id != %s
-                ORDER BY search_date DESC, search_time DESC
-            """, (search_query, current_search_id))
-            previous_searches = cursor.fetchall()
+            current_search_id, current_date, current_time = insereaza_cautare_twitter(
+                cursor, search_query, since_search_id)
             
             # Save current results
-            result_insert_query = """
-                INSERT INTO twitter_results 
-                (search_id, username, tweet_content, tweet_link, tweet_date, 
-                tweet_time, reply_count, repost_count, like_count)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            for result in results:
-                cleaned_username = clean_username(result['username'])
-                metrics = result.get('metrics', {
-                    'replies': 0, 'reposts': 0,
-                    'likes': 0
-                })
-                
-                values = (
-                    current_search_id,
-                    cleaned_username,
-                    result['content'],
-                    result['link'],
-                    result.get('date', current_date),
-                    result.get('time', current_time),
-                    metrics['replies'],
-                    metrics['reposts'],
-                    metrics['likes']
-                )
-                cursor.execute(result_insert_query, values)
+            insereaza_rezultate_twitter(cursor, current_search_id, results, current_date, current_time)
             
             # Create history records
-            if previous_searches:
-                for prev_search_id, prev_date, prev_time in previous_searches:
-                    changes = compare_twitter_search_results_with_cursor(cursor, prev_search_id, current_search_id)
-                    
-                    history_insert_query = """
-                        INSERT INTO twitter_search_history 
-                        (original_search_id, related_search_id, comparison_date, 
-                         comparison_time, changes_detected, new_tweets_count, 
-                         removed_tweets_count, engagement_changes)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    """
-                    
-                    cursor.execute(history_insert_query, (
-                        prev_search_id,
-                        current_search_id,
-                        current_date,
-                        current_time,
-                        changes['has_changes'],
-                        changes['new_tweets'],
-                        changes['removed_tweets'],
-                        json.dumps(changes['engagement_changes'])
-                    ))
+            creeaza_istoric_twitter(cursor, search_query, current_search_id, current_date, current_time)
             
             # Commit transaction
             connection.commit()
@@ -967,8 +3086,205 @@ def save_twitter_results(search_query, results):
         if connection:
             connection.close()
 
+def amprenta_query(search_query):
+    """
+    Amprenta indexată a unui query: SHA-1 al query-ului canonic (litere mici, spațiile de la capete
+    eliminate, spațiile multiple reduse la unul). Literele mici păstrează comportamentul vechii
+    comparații search_query = %s prin colația case-insensitive: "OSINT" și "osint" au același istoric.
+    Toate căutările după query folosesc coloana query_hash în locul comparației pe coloana TEXT search_query.
+    """
+    return hashlib.sha1(' '.join(search_query.lower().split()).encode('utf-8')).hexdigest()
+
+def insereaza_cautare_twitter(cursor, search_query, since_search_id=None):
+    """
+    Inserează o nouă căutare Twitter și returnează (search_id, dată, oră).
+    - O căutare completă își începe propriul lanț (chain_root_id = search_id)
+    - O căutare incrementală păstrează marcajul since_search_id și rădăcina lanțului căutării
+      continuate; vederea twitter_results îi adaugă tweet-urile salvate de căutările din lanț
+    """
+    chain_root_id = None
+    if since_search_id:
+        cursor.execute("SELECT chain_root_id FROM twitter_searches WHERE search_id = %s", (since_search_id,))
+        row = cursor.fetchone()
+        chain_root_id = row[0] if row else None
+        if chain_root_id is None:
+            since_search_id = None
+    search_insert_query = """
+        INSERT INTO twitter_searches (search_query, query_hash, since_search_id, chain_root_id, search_date, search_time)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """
+    current_date = datetime.now().date()
+    current_time = datetime.now().time()
+    cursor.execute(search_insert_query, (search_query, amprenta_query(search_query), since_search_id,
+                                         chain_root_id, current_date, current_time))
+    search_id = cursor.lastrowid
+    if chain_root_id is None:
+        cursor.execute("UPDATE twitter_searches SET chain_root_id = search_id WHERE search_id = %s", (search_id,))
+    return search_id, current_date, current_time
+
+def insereaza_rezultate_twitter(cursor, search_id, results, current_date, current_time, batch_size=None,
+                                start_position=0):
+    """
+    Inserează tweet-urile unei căutări folosind cursorul dat, în stocarea canonică:
+    - tweets: un rând per link, inserat doar prima dată când tweet-ul este văzut
+    - tweet_versions: textul tweet-ului, inserat doar când hash-ul conținutului se schimbă
+    - tweet_observations: rândul ușor al căutării (poziție, versiune, metrici)
+    """
+    first_seen = datetime.now()
+    tweets = {}
+    versions = {}
+    observed = []
+    for result in results:
+        link_hash = hash_continut(result['link'])
+        tweets[link_hash] = (
+            link_hash,
+            result['link'],
+            clean_username(result['username']),
+            result.get('date', current_date),
+            result.get('time', current_time)
+        )
+        observed.append((link_hash, hash_continut(link_hash, result['content']), result))
+
+    tweet_ids = asigura_randuri_canonice(
+        cursor, 'tweets', ('link_hash', 'tweet_link', 'username', 'tweet_date', 'tweet_time'),
+        tweets, 'tweet_id', batch_size
+    )
+    observations = []
+    for position, (link_hash, version_hash, result) in enumerate(observed, start_position):
+        versions[version_hash] = (version_hash, tweet_ids[link_hash], result['content'], first_seen)
+        metrics = result.get('metrics', {
+            'replies': 0, 'reposts': 0,
+            'likes': 0
+        })
+        observations.append((
+            search_id,
+            tweet_ids[link_hash],
+            position,
+            version_hash,
+            metrics['replies'],
+            metrics['reposts'],
+            metrics['likes'],
+            metrics.get('bookmarks', 0)
+        ))
+    asigura_randuri_canonice(cursor, 'tweet_versions', ('version_hash', 'tweet_id', 'tweet_content', 'first_seen'),
+                             versions, batch_size=batch_size)
+    insereaza_in_loturi(cursor, """
+        INSERT INTO tweet_observations
+        (search_id, tweet_id, result_position, version_hash,
+        reply_count, repost_count, like_count, bookmark_count)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """, observations, batch_size)
+
+def creeaza_istoric_twitter(cursor, search_query, current_search_id, current_date, current_time):
+    """
+    Compară căutarea curentă doar cu căutarea imediat anterioară pentru același query
+    și salvează istoricul ca un lanț (o comparație și un rând de istoric per căutare).
+    Comparațiile între căutări oarecare se calculează la cerere (/compare_searches).
+    """
+    # Get the immediately previous search for this query
+    cursor.execute("""
+        SELECT search_id
+        FROM twitter_searches 
+        WHERE query_hash = %s AND search_id < %s
+        ORDER BY search_id DESC
+        LIMIT 1
+    """, (amprenta_query(search_query), current_search_id))
+    row = cursor.fetchone()
+
+    if row:
+        prev_search_id = row[0]
+        changes = compare_twitter_search_results_with_cursor(cursor, prev_search_id, current_search_id)
+        
+        history_insert_query = """
+            INSERT INTO twitter_search_history 
+            (original_search_id, related_search_id, comparison_date, 
+             comparison_time, changes_detected, new_tweets_count, 
+             removed_tweets_count, engagement_changes)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        
+        cursor.execute(history_insert_query, (
+            prev_search_id,
+            current_search_id,
+            current_date,
+            current_time,
+            changes['has_changes'],
+            changes['new_tweets'],
+            changes['removed_tweets'],
+            json.dumps(changes['engagement_changes'])
+        ))
+
+def colecteaza_si_salveaza_twitter(search_query, target_count=TWITTER_SCROLL_TARGET,
+                                   time_budget=TWITTER_SCROLL_TIME_BUDGET, batch_size=TWITTER_SCROLL_SAVE_BATCH,
+                                   since=None):
+    """
+    Colectează tweet-uri prin scroll continuu și le salvează în loturi, cu commit după fiecare lot.
+    Este un generator: produce (search_id, lot) după fiecare lot salvat.
+    Cu since, derularea se oprește la tweet-urile deja salvate; căutarea nouă păstrează doar tweet-urile noi
+    și marcajul căutării anterioare, prin care sunt citite și cele deja salvate.
+    """
+    db_manager = DatabaseConnectionManager()
+    connection = db_manager.get_connection()
+    cursor = connection.cursor(buffered=True)
+    try:
+        # Căutarea este confirmată împreună cu primul lot, deci un scrape eșuat nu lasă căutări goale în istoric
+        search_id, current_date, current_time = insereaza_cautare_twitter(
+            cursor, search_query, since and since['search_id'])
+
+        batch = []
+        saved = 0
+        for tweet in scrape_twitter_stream(search_query, target_count, time_budget, since):
+            batch.append(tweet)
+            if len(batch) >= batch_size:
+                insereaza_rezultate_twitter(cursor, search_id, batch, current_date, current_time,
+                                            start_position=saved)
+                connection.commit()
+                saved += len(batch)
+                yield search_id, batch
+                batch = []
+        if batch:
+            insereaza_rezultate_twitter(cursor, search_id, batch, current_date, current_time,
+                                        start_position=saved)
+            connection.commit()
+            saved += len(batch)
+            yield search_id, batch
+
+        if saved == 0 and not since:
+            # Fără tweet-uri nu păstrăm căutarea; una incrementală goală rămâne, fiindcă citește lanțul anterior
+            connection.rollback()
+            logger.info(f"Twitter search for {search_query!r} returned no tweets, search discarded")
+            return
+
+        creeaza_istoric_twitter(cursor, search_query, search_id, current_date, current_time)
+        connection.commit()
+    except Exception as e:
+        logger.error(f"Error in streaming Twitter collection: {e}")
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        cursor.close()
+        connection.close()
+
+# Tweet-urile unei căutări includ lanțul ei incremental; la același link câștigă observația cea mai nouă
+TWITTER_COMPARE_ROWS_QUERY = """
+    SELECT t.tweet_link, o.reply_count, o.repost_count, o.like_count
+    FROM twitter_searches s
+    JOIN twitter_searches m ON m.chain_root_id = s.chain_root_id AND m.search_id <= s.search_id
+    JOIN tweet_observations o ON o.search_id = m.search_id
+    JOIN tweets t ON t.tweet_id = o.tweet_id
+    WHERE s.search_id = %s
+    ORDER BY m.search_id, o.result_position
+"""
+
 def compare_twitter_search_results_with_cursor(cursor, original_search_id, new_search_id):
-    """Compare results between two Twitter searches using provided cursor"""
+    """
+    Compare results between two Twitter searches using provided cursor.
+    Fiecare căutare este citită o singură dată prin indexul (search_id, tweet_id) al observațiilor,
+    iar diferențele se calculează cu dicționare în loc de subinterogări NOT IN.
+    """
     try:
         changes = {
             'has_changes': False,
@@ -977,51 +3293,27 @@ def compare_twitter_search_results_with_cursor(cursor, original_search_id, new_s
             'engagement_changes': []
         }
         
-        comparison_query = """
-        WITH original_tweets AS (
-            SELECT tweet_link, tweet_content, reply_count, repost_count, 
-                   like_count
-            FROM twitter_results 
-            WHERE search_id = %s
-        ),
-        new_tweets AS (
-            SELECT tweet_link, tweet_content, reply_count, repost_count, 
-                   like_count
-            FROM twitter_results 
-            WHERE search_id = %s
-        )
-        SELECT
-            (SELECT COUNT(*) FROM new_tweets 
-             WHERE tweet_link NOT IN (SELECT tweet_link FROM original_tweets)) as new_count,
-            (SELECT COUNT(*) FROM original_tweets 
-             WHERE tweet_link NOT IN (SELECT tweet_link FROM new_tweets)) as removed_count,
-            JSON_ARRAYAGG(
-                JSON_OBJECT(
-                    'tweet_link', nt.tweet_link,
-                    'engagement_diff', JSON_OBJECT(
-                        'replies', nt.reply_count - ot.reply_count,
-                        'reposts', nt.repost_count - ot.repost_count,
-                        'likes', nt.like_count - ot.like_count
-                    )
-                )
-            ) as engagement_changes
-        FROM original_tweets ot
-        JOIN new_tweets nt ON ot.tweet_link = nt.tweet_link
-        WHERE nt.reply_count != ot.reply_count
-           OR nt.repost_count != ot.repost_count
-           OR nt.like_count != ot.like_count
-        """
-        
-        cursor.execute(comparison_query, (original_search_id, new_search_id))
-        result = cursor.fetchone()
-        
-        if result:
-            changes['new_tweets'] = result[0]
-            changes['removed_tweets'] = result[1]
-            changes['engagement_changes'] = json.loads(result[2]) if result[2] else []
-            changes['has_changes'] = (changes['new_tweets'] > 0 or 
-                                    changes['removed_tweets'] > 0 or 
-                                    len(changes['engagement_changes']) > 0)
+        cursor.execute(TWITTER_COMPARE_ROWS_QUERY, (original_search_id,))
+        original_tweets = {row[0]: row[1:] for row in cursor.fetchall()}
+        cursor.execute(TWITTER_COMPARE_ROWS_QUERY, (new_search_id,))
+        new_tweets = {row[0]: row[1:] for row in cursor.fetchall()}
+
+        changes['new_tweets'] = len(new_tweets.keys() - original_tweets.keys())
+        changes['removed_tweets'] = len(original_tweets.keys() - new_tweets.keys())
+        for tweet_link, (replies, reposts, likes) in new_tweets.items():
+            previous = original_tweets.get(tweet_link)
+            if previous and previous != (replies, reposts, likes):
+                changes['engagement_changes'].append({
+                    'tweet_link': tweet_link,
+                    'engagement_diff': {
+                        'replies': replies - previous[0],
+                        'reposts': reposts - previous[1],
+                        'likes': likes - previous[2]
+                    }
+                })
+        changes['has_changes'] = (changes['new_tweets'] > 0 or 
+                                changes['removed_tweets'] > 0 or 
+                                len(changes['engagement_changes']) > 0)
         
         return changes
         
@@ -1042,11 +3334,11 @@ def get_search_history(search_query):
             FROM twitter_searches ts
             LEFT JOIN twitter_results tr ON ts.search_id = tr.search_id
             LEFT JOIN twitter_search_history th ON ts.search_id = th.related_search_id
-            WHERE ts.search_query = %s
+            WHERE ts.query_hash = %s
             GROUP BY ts.search_id
             ORDER BY ts.search_date DESC, ts.search_time DESC
         """
-        cursor.execute(history_query, (search_query,))
+        cursor.execute(history_query, (amprenta_query(search_query),))
         return cursor.fetchall()
         
     except mysql.connector.Error as e:
@@ -1061,6 +3353,11 @@ def search_twitter():
         
         if not search_query:
             return render_template('index.html', error="Please enter at least one search term")
+
+        if request.form.get('async') == 'true':
+            max_tweets = int(request.form.get('max_tweets', TWITTER_MAX_TWEETS))
+            job = search_jobs.submit('twitter', search_query, pipeline_twitter, max_tweets=max_tweets)
+            return jsonify({'job_id': job.job_id, 'events': url_for('search_job_events', job_id=job.job_id)}), 202
             
         print(f"Searching Twitter with advanced query: {search_query}")
         twitter_results = scrape_twitter(search_query)
@@ -1100,99 +3397,281 @@ def save_google_results(search_query, results):
         connection.start_transaction()
             
         # Save search query
-        search_insert_query = """
-            INSERT INTO google_searches (search_query, search_date, search_time)
-            VALUES (%s, %s, %s)
-        """
-        current_date = datetime.now().date()
-        current_time = datetime.now().time()
-            
-        cursor.execute(search_insert_query, (search_query, current_date, current_time))
-        current_search_id = cursor.lastrowid
-            
-        # Get previous searches for this query
-        cursor.execute("""
-            SELECT search_id, search_date, search_time 
-            FROM google_searches 
-            WHERE search_query = %s AND search_id != %s
-            ORDER BY search_date DESC, search_time DESC
-        """, (search_query, current_search_id))
-        previous_searches = cursor.fetchall()
+        current_search_id, current_date, current_time = insereaza_cautare_google(cursor, search_query)
             
         # Save results
-        result_insert_query = """
-            INSERT INTO google_results 
-            (search_id, site_name, result_link, result_title, result_content, 
-            publish_date, publish_time)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-            
-        for result in results:
-            # Extract domain name from URL
-            site_name = urlparse(result['link']).netloc
-                
-            values = (
-                current_search_id,
-                site_name,
-                result['link'],
-                result['title'],
-                result['description'],
-                None,  # publish_date
-                None   # publish_time
-            )
-            cursor.execute(result_insert_query, values)
+        insereaza_rezultate_google(cursor, current_search_id, results)
             
         # Create history records
-        if previous_searches:
-            for prev_search_id, prev_date, prev_time in previous_searches:
-                # Use the same cursor for comparing results
-                changes = compare_google_search_results_with_cursor(cursor, prev_search_id, current_search_id)
-                    
-                history_insert_query = """
-                    INSERT INTO google_search_history 
-                    (original_search_id, related_search_id, comparison_date, 
-                     comparison_time, changes_detected, new_results_count, 
-                     removed_results_count)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """
-                    
-                cursor.execute(history_insert_query, (
-                    prev_search_id,
-                    current_search_id,
-                    current_date,
-                    current_time,
-                    changes['has_changes'],
-                    changes['new_results'],
-                    changes['removed_results']
-                ))
+        creeaza_istoric_google(cursor, search_query, current_search_id, current_date, current_time)
             
         connection.commit()
         logger.info(f"Successfully saved {len(results)} Google results to database")
         return True
             
     except Exception as e:
-        logger.error(f"Error saving Google results: {e}")
-        if connection:
-            try:
-                connection.rollback()
-            except:
-                pass
-        return False
-            
+        logger.error(f"Error saving Google results: {e}")
+        if connection:
+            try:
+                connection.rollback()
+            except:
+                pass
+        return False
+            
+    finally:
+        if cursor:
+            try:
+                cursor.close()
+            except:
+                pass
+        if connection:
+            try:
+                connection.close()
+            except:
+                pass
+
+def insereaza_cautare_google(cursor, search_query):
+    """Inserează o nouă căutare Google și returnează (search_id, dată, oră)"""
+    search_insert_query = """
+        INSERT INTO google_searches (search_query, query_hash, search_date, search_time)
+        VALUES (%s, %s, %s, %s)
+    """
+    current_date = datetime.now().date()
+    current_time = datetime.now().time()
+    cursor.execute(search_insert_query, (search_query, amprenta_query(search_query), current_date, current_time))
+    return cursor.lastrowid, current_date, current_time
+
+def insereaza_in_loturi(cursor, query, rows, batch_size=None):
+    """
+    Inserează rândurile în loturi de batch_size prin executemany; mysql-connector
+    rescrie fiecare lot într-un singur INSERT cu VALUES multiple (un singur round trip).
+    Cu batch_size 1 se păstrează vechiul comportament, un execute per rând.
+    """
+    batch_size = batch_size or DB_INSERT_BATCH_SIZE
+    if batch_size <= 1:
+        for row in rows:
+            cursor.execute(query, row)
+        return
+    for start in range(0, len(rows), batch_size):
+        cursor.executemany(query, rows[start:start + batch_size])
+
+def hash_continut(*parts):
+    """SHA-1 hex al părților unite prin \\0 (None devine șir gol) - cheia stocării canonice"""
+    return hashlib.sha1('\0'.join('' if part is None else str(part) for part in parts).encode('utf-8')).hexdigest()
+
+def _citeste_dupa_hash(cursor, table, hash_column, value_column, hashes):
+    found = {}
+    for start in range(0, len(hashes), DB_INSERT_BATCH_SIZE):
+        chunk = hashes[start:start + DB_INSERT_BATCH_SIZE]
+        cursor.execute(
+            f"SELECT {hash_column}, {value_column} FROM {table} WHERE {hash_column} IN ({','.join(['%s'] * len(chunk))})",
+            chunk
+        )
+        found.update(cursor.fetchall())
+    return found
+
+def asigura_randuri_canonice(cursor, table, columns, rows, value_column=None, batch_size=None):
+    """
+    Inserează într-un tabel canonic doar rândurile al căror hash (prima coloană) lipsește.
+    rows: {hash: valorile pentru columns}. Returnează {hash: value_column} (ex. id-ul entității).
+    """
+    value_column = value_column or columns[0]
+    existing = _citeste_dupa_hash(cursor, table, columns[0], value_column, list(rows))
+    missing = [row for row_hash, row in rows.items() if row_hash not in existing]
+    if missing:
+        # ON DUPLICATE KEY acoperă o inserare concurentă a aceluiași hash
+        insereaza_in_loturi(cursor, f"""
+            INSERT INTO {table} ({', '.join(columns)})
+            VALUES ({', '.join(['%s'] * len(columns))})
+            ON DUPLICATE KEY UPDATE {columns[0]} = {columns[0]}
+        """, missing, batch_size)
+        existing.update(_citeste_dupa_hash(cursor, table, columns[0], value_column, [row[0] for row in missing]))
+    return existing
+
+def insereaza_rezultate_google(cursor, search_id, results, batch_size=None, start_position=0):
+    """
+    Inserează rezultatele unei căutări Google folosind cursorul dat, în stocarea canonică:
+    - pages: un rând per URL, inserat doar prima dată când pagina este văzută
+    - page_versions: titlul și descrierea, inserate doar când hash-ul conținutului se schimbă
+    - page_observations: rândul ușor al căutării (poziție, versiune)
+    """
+    first_seen = datetime.now()
+    pages = {}
+    versions = {}
+    observed = []
+    for result in results:
+        url_hash = hash_continut(result['link'])
+        # Extract domain name from URL
+        pages[url_hash] = (url_hash, result['link'], urlparse(result['link']).netloc)
+        observed.append((url_hash, hash_continut(url_hash, result['title'], result['description']), result))
+
+    page_ids = asigura_randuri_canonice(cursor, 'pages', ('url_hash', 'url', 'site_name'), pages, 'page_id', batch_size)
+    observations = []
+    for position, (url_hash, version_hash, result) in enumerate(observed, start_position):
+        versions[version_hash] = (version_hash, page_ids[url_hash], result['title'], result['description'], first_seen)
+        observations.append((search_id, page_ids[url_hash], position, version_hash))
+    asigura_randuri_canonice(
+        cursor, 'page_versions', ('version_hash', 'page_id', 'result_title', 'result_content', 'first_seen'),
+        versions, batch_size=batch_size
+    )
+    insereaza_in_loturi(cursor, """
+        INSERT INTO page_observations (search_id, page_id, result_position, version_hash)
+        VALUES (%s, %s, %s, %s)
+    """, observations, batch_size)
+
+def creeaza_istoric_google(cursor, search_query, current_search_id, current_date, current_time):
+    """
+    Compară căutarea curentă doar cu căutarea imediat anterioară pentru același query
+    și salvează istoricul ca un lanț (o comparație și un rând de istoric per căutare).
+    Comparațiile între căutări oarecare se calculează la cerere (/compare_searches).
+    """
+    # Get the immediately previous search for this query
+    cursor.execute("""
+        SELECT search_id
+        FROM google_searches 
+        WHERE query_hash = %s AND search_id < %s
+        ORDER BY search_id DESC
+        LIMIT 1
+    """, (amprenta_query(search_query), current_search_id))
+    row = cursor.fetchone()
+
+    if row:
+        prev_search_id = row[0]
+        # Use the same cursor for comparing results
+        changes = compare_google_search_results_with_cursor(cursor, prev_search_id, current_search_id)
+            
+        history_insert_query = """
+            INSERT INTO google_search_history 
+            (original_search_id, related_search_id, comparison_date, 
+             comparison_time, changes_detected, new_results_count, 
+             removed_results_count)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """
+            
+        cursor.execute(history_insert_query, (
+            prev_search_id,
+            current_search_id,
+            current_date,
+            current_time,
+            changes['has_changes'],
+            changes['new_results'],
+            changes['removed_results']
+        ))
+
+def colecteaza_google_paginat(search_query, num_results=GOOGLE_STREAM_MAX_RESULTS,
+                              batch_size=GOOGLE_STREAM_BATCH_SIZE, deep=False, lang='ro', search_id=None):
+    """
+    Colectează până la num_results rezultate Google în mod streaming:
+    - Cere rezultatele pagină cu pagină (search() cu start_num), câte un token de rate limit per pagină
+    - Îmbogățește și salvează rezultatele în loturi de batch_size, cu commit după fiecare lot
+    - Căutarea este inserată în aceeași tranzacție cu primul lot salvat
+    - Rezultatele parțiale rămân salvate și vizibile în UI chiar dacă o pagină ulterioară eșuează,
+      dar eroarea este transmisă apelantului și istoricul comparativ nu mai este creat
+    - Fără niciun rezultat salvat nu rămâne nicio căutare goală; un search_id creat dinainte
+      de apelant (/search_paginated) este șters
+    - Istoricul comparativ este creat la final, după salvarea tuturor loturilor
+    Este un generator: produce (search_id, lot_îmbogățit) după fiecare lot salvat.
+    """
+    db_manager = DatabaseConnectionManager()
+    connection = db_manager.get_connection()
+    cursor = connection.cursor(buffered=True)
+    precreated_id = search_id
+    current_date, current_time = datetime.now().date(), datetime.now().time()
+    try:
+        seen_links = set()
+        batch = []
+        consumed = 0
+        total_saved = 0
+        error = None
+
+        def salveaza_lot(batch):
+            nonlocal search_id, current_date, current_time
+            enriched = imbogateste_rezultate(batch, deep=deep)
+            if enriched:
+                if search_id is None:
+                    search_id, current_date, current_time = insereaza_cautare_google(cursor, search_query)
+                insereaza_rezultate_google(cursor, search_id, enriched, start_position=total_saved)
+                connection.commit()
+            return enriched
+
+        try:
+            page_start = 0
+            while consumed < num_results:
+                if page_start:
+                    time.sleep(GOOGLE_STREAM_PAGE_INTERVAL)
+                # Fiecare pagină este o cerere separată către Google - un token per cerere
+                rate_limiter.acquire('google')
+                page = list(search(search_query, num_results=GOOGLE_PAGE_SIZE, lang=lang,
+                                   advanced=True, start_num=page_start))
+                page_start += GOOGLE_PAGE_SIZE
+                new_on_page = 0
+                for result in page[:num_results - consumed]:
+                    consumed += 1
+                    link = result.url if hasattr(result, 'url') else str(result)
+                    if link not in seen_links:
+                        seen_links.add(link)
+                        batch.append(result)
+                        new_on_page += 1
+                    if len(batch) >= batch_size:
+                        enriched = salveaza_lot(batch)
+                        total_saved += len(enriched)
+                        batch = []
+                        if enriched:
+                            yield search_id, enriched
+                if new_on_page == 0 or len(page) < GOOGLE_PAGE_SIZE:
+                    # Pagină goală, repetată sau incompletă - Google nu mai are rezultate
+                    break
+            rate_limiter.report_success('google')
+        except Exception as e:
+            # Salvăm ce am primit până acum, apoi raportăm eroarea apelantului
+            rate_limiter.report_error('google')
+            logger.error(f"Paginated Google search stopped after {consumed} results: {e}")
+            error = e
+
+        if batch:
+            enriched = salveaza_lot(batch)
+            total_saved += len(enriched)
+            if enriched:
+                yield search_id, enriched
+
+        if total_saved == 0:
+            connection.rollback()
+            if precreated_id is not None:
+                cursor.execute("DELETE FROM google_searches WHERE search_id = %s", (precreated_id,))
+                connection.commit()
+            logger.info(f"Paginated Google search for {search_query!r} saved no results, search discarded")
+        elif error is None:
+            # O colectare întreruptă ar raporta ca eliminate rezultatele neajunse - fără comparație
+            creeaza_istoric_google(cursor, search_query, search_id, current_date, current_time)
+            connection.commit()
+            logger.info(f"Paginated Google search saved {total_saved} results for search {search_id}")
+        if error is not None:
+            raise error
+
+    except Exception as e:
+        logger.error(f"Error in paginated Google collection: {e}")
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+        raise
     finally:
-        if cursor:
-            try:
-                cursor.close()
-            except:
-                pass
-        if connection:
-            try:
-                connection.close()
-            except:
-                pass
+        cursor.close()
+        connection.close()
+
+GOOGLE_COMPARE_ROWS_QUERY = """
+    SELECT o.search_id, p.url
+    FROM page_observations o
+    JOIN pages p ON p.page_id = o.page_id
+    WHERE o.search_id IN (%s, %s)
+"""
 
 def compare_google_search_results_with_cursor(cursor, original_search_id, new_search_id):
-    """Compare results between two Google searches using provided cursor"""
+    """
+    Compare results between two Google searches using provided cursor.
+    Link-urile ambelor căutări vin dintr-o singură citire prin indexul (search_id, page_id)
+    al observațiilor; diferența se calculează pe mulțimi.
+    """
     try:
         changes = {
             'has_changes': False,
@@ -1200,31 +3679,14 @@ def compare_google_search_results_with_cursor(cursor, original_search_id, new_se
             'removed_results': 0
         }
         
-        comparison_query = """
-        WITH original_results AS (
-            SELECT result_link
-            FROM google_results 
-            WHERE search_id = %s
-        ),
-        new_results AS (
-            SELECT result_link
-            FROM google_results 
-            WHERE search_id = %s
-        )
-        SELECT
-            (SELECT COUNT(*) FROM new_results 
-             WHERE result_link NOT IN (SELECT result_link FROM original_results)) as new_count,
-            (SELECT COUNT(*) FROM original_results 
-             WHERE result_link NOT IN (SELECT result_link FROM new_results)) as removed_count
-        """
-        
-        cursor.execute(comparison_query, (original_search_id, new_search_id))
-        result = cursor.fetchone()
-        
-        if result:
-            changes['new_results'] = result[0]
-            changes['removed_results'] = result[1]
-            changes['has_changes'] = (changes['new_results'] > 0 or changes['removed_results'] > 0)
+        cursor.execute(GOOGLE_COMPARE_ROWS_QUERY, (original_search_id, new_search_id))
+        links = {original_search_id: set(), new_search_id: set()}
+        for search_id, result_link in cursor.fetchall():
+            links[search_id].add(result_link)
+
+        changes['new_results'] = len(links[new_search_id] - links[original_search_id])
+        changes['removed_results'] = len(links[original_search_id] - links[new_search_id])
+        changes['has_changes'] = (changes['new_results'] > 0 or changes['removed_results'] > 0)
         
         return changes
         
@@ -1266,79 +3728,50 @@ def execute_db_query(query, params=None, fetch=True):
 def get_search_history():
     """Get combined search history for both Google and Twitter searches"""
     try:
-        # First get all individual searches
-        all_searches = execute_db_query("""
-            SELECT 
-                'google' as source,
-                search_id,
-                search_query,
-                search_date,
-                search_time
-            FROM google_searches
-            UNION ALL
-            SELECT 
-                'twitter' as source,
-                search_id,
-                search_query,
-                search_date,
-                search_time
-            FROM twitter_searches
-            ORDER BY search_date DESC, search_time DESC
-        """)
-        
-        # Create timestamp dictionary
-        latest_timestamps = {}
-        for search in all_searches:
-            timestamp = f"{search['search_date']} {search['search_time']}"
-            if search['search_query'] not in latest_timestamps or timestamp > latest_timestamps[search['search_query']]['timestamp']:
-                latest_timestamps[search['search_query']] = {
-                    'timestamp': timestamp,
-                    'source': search['source']
-                }
-        
-        # Get Google history
+        # Get Google history - grupat după amprenta query-ului, cu ultima rulare a fiecărei amprente
         google_history = execute_db_query("""
             SELECT 
                 'google' as source,
-                gs.search_query as query,
+                MIN(gs.search_query) as query,
                 COUNT(DISTINCT gs.search_id) as search_count,
                 COUNT(DISTINCT gr.result_id) as total_results,
                 GROUP_CONCAT(DISTINCT gs.search_id) as search_ids,
-                MAX(COALESCE(gh.changes_detected, FALSE)) as had_changes
+                MAX(COALESCE(gh.changes_detected, FALSE)) as had_changes,
+                MAX(TIMESTAMP(gs.search_date, gs.search_time)) as latest_timestamp
             FROM google_searches gs
             LEFT JOIN google_results gr ON gs.search_id = gr.search_id
             LEFT JOIN google_search_history gh ON gs.search_id = gh.related_search_id
-            GROUP BY gs.search_query
+            GROUP BY gs.query_hash
         """)
 
         # Get Twitter history
         twitter_history = execute_db_query("""
             SELECT 
                 'twitter' as source,
-                ts.search_query as query,
+                MIN(ts.search_query) as query,
                 COUNT(DISTINCT ts.search_id) as search_count,
                 COUNT(DISTINCT tr.result_id) as total_results,
                 GROUP_CONCAT(DISTINCT ts.search_id) as search_ids,
-                MAX(COALESCE(th.changes_detected, FALSE)) as had_changes
+                MAX(COALESCE(th.changes_detected, FALSE)) as had_changes,
+                MAX(TIMESTAMP(ts.search_date, ts.search_time)) as latest_timestamp
             FROM twitter_searches ts
             LEFT JOIN twitter_results tr ON ts.search_id = tr.search_id
             LEFT JOIN twitter_search_history th ON ts.search_id = th.related_search_id
-            GROUP BY ts.search_query
+            GROUP BY ts.query_hash
         """)
 
         # Combine and format history
         combined_history = []
         for item in google_history + twitter_history:
-            if item['query'] in latest_timestamps:
-                combined_history.append({
-                    'source': item['source'],
-                    'query': item['query'],
-                    'search_count': item['search_count'],
-                    'total_results': item['total_results'],
-                    'search_ids': str(item['search_ids']).split(',') if item['search_ids'] else [],
-                    'had_changes': bool(item['had_changes']),
-                    'latest_timestamp': latest_timestamps[item['query']]['timestamp']
-                })
+            combined_history.append({
+                'source': item['source'],
+                'query': item['query'],
+                'search_count': item['search_count'],
+                'total_results': item['total_results'],
+                'search_ids': str(item['search_ids']).split(',') if item['search_ids'] else [],
+                'had_changes': bool(item['had_changes']),
+                'latest_timestamp': item['latest_timestamp']
+            })
 
         # Sort by latest timestamp
         combined_history.sort(key=lambda x: x['latest_timestamp'], reverse=True)
@@ -1353,6 +3786,44 @@ def get_search_history():
         logger.error(f"Error retrieving search history: {e}")
         return jsonify([])
 
+@app.route('/http_stats')
+def get_http_stats():
+    """Statistici pentru clientul HTTP partajat (reutilizare conexiuni, handshake, DNS)"""
+    return jsonify(HttpFetchClient().stats())
+
+@app.route('/browser_pool_stats')
+def get_browser_pool_stats():
+    """Starea pool-ului de browsere Chrome folosit pentru Twitter"""
+    return jsonify(browser_pool.stats())
+
+@app.route('/twitter_executor_stats')
+def get_twitter_executor_stats():
+    """Căutările Twitter rulate în paralel și ocuparea fiecărui cont"""
+    return jsonify(twitter_executor.stats())
+
+@app.route('/wait_stats')
+def get_wait_stats():
+    """Durata reală a așteptărilor din fluxul Twitter, pe tip de așteptare"""
+    return jsonify(waiter.stats())
+
+@app.route('/rate_limiter_stats')
+def get_rate_limiter_stats():
+    """Rata curentă, erorile și coada de așteptare pentru fiecare sursă"""
+    return jsonify(rate_limiter.stats())
+
+@app.route('/pdf_stats')
+def get_pdf_stats():
+    """Statistici pentru extragerea textului din PDF-uri (inclusiv pagini/secundă)"""
+    return jsonify(pdf_stats.snapshot())
+
+@app.route('/cache_stats')
+def get_cache_stats():
+    """Statistici hit/miss pentru cache-urile aplicației"""
+    return jsonify({
+        'url_metadata': url_cache.stats(),
+        'google_queries': google_search_cache.stats()
+    })
+
 @app.route('/rerun_search/<source>/<int:search_id>', methods=['POST'])
 def rerun_search(source, search_id):
     """Rerun a previous search"""
@@ -1384,18 +3855,8 @@ def rerun_search(source, search_id):
                 # Perform Google search
                 search_results = perform_google_search(search_query)
                 if search_results:
-                    results_with_info = []
-                    for result in search_results:
-                        try:
-                            title, description, _ = extrage_info_pagina(result)
-                            results_with_info.append({
-                                'link': result.url if hasattr(result, 'url') else str(result),
-                                'title': title,
-                                'description': description
-                            })
-                        except Exception as e:
-                            logger.error(f"Error processing result: {str(e)}")
-                            continue
+                    deep = (request.get_json(silent=True) or {}).get('deep', False) or request.args.get('deep') == 'true'
+                    results_with_info = imbogateste_rezultate(search_results, deep=deep)
                     
                     if results_with_info:
                         save_google_results(search_query, results_with_info)
@@ -1405,13 +3866,16 @@ def rerun_search(source, search_id):
                         'results': results_with_info
                     })
             else:
-                # Perform Twitter search
-                twitter_results = scrape_twitter(search_query)
+                # Perform Twitter search - doar tweet-urile apărute după ultima căutare salvată
+                since = marcaj_twitter(search_query)
+                twitter_results = scrape_twitter(search_query, since=since)
                 if twitter_results:
-                    save_twitter_results(search_query, twitter_results)
+                    save_twitter_results(search_query, twitter_results, since_search_id=since and since['search_id'])
+                if twitter_results or since:
                     return jsonify({
                         'status': 'success',
-                        'results': twitter_results
+                        'results': twitter_results,
+                        'new_tweets': len(twitter_results)
                     })
         
         return jsonify({'error': 'Search not found'}), 404
@@ -1438,13 +3902,13 @@ def get_search_details(source, search_id):
         # Mai întâi obținem query-ul original
         if source == 'google':
             query = """
-                SELECT search_query 
+                SELECT search_query, query_hash 
                 FROM google_searches 
                 WHERE search_id = %s
             """
         else:
             query = """
-                SELECT search_query 
+                SELECT search_query, query_hash 
                 FROM twitter_searches 
                 WHERE search_id = %s
             """
@@ -1455,68 +3919,63 @@ def get_search_details(source, search_id):
         if not result:
             return jsonify({'error': 'Search not found'}), 404
             
-        search_query = result[0]
+        search_query, query_hash = result
         
-        # Apoi obținem toate instanțele pentru acest query
+        # Apoi obținem toate instanțele pentru acest query, cu rezultatele în ordinea din pagină
         if source == 'google':
             instances_query = """
-                SELECT 
-                    gs.search_id,
-                    gs.search_date,
-                    gs.search_time,
-                    JSON_ARRAYAGG(
-                        JSON_OBJECT(
-                            'link', gr.result_link,
-                            'title', gr.result_title,
-                            'content', gr.result_content
-                        )
-                    ) as results
+                SELECT gs.search_id, gs.search_date, gs.search_time,
+                       gr.result_link, gr.result_title, gr.result_content
                 FROM google_searches gs
                 LEFT JOIN google_results gr ON gs.search_id = gr.search_id
-                WHERE gs.search_query = %s
-                GROUP BY gs.search_id, gs.search_date, gs.search_time
-                ORDER BY gs.search_date DESC, gs.search_time DESC
+                WHERE gs.query_hash = %s
+                ORDER BY gs.search_date DESC, gs.search_time DESC, gs.search_id DESC, gr.result_position
             """
         else:
             instances_query = """
-                SELECT 
-                    ts.search_id,
-                    ts.search_date,
-                    ts.search_time,
-                    JSON_ARRAYAGG(
-                        JSON_OBJECT(
-                            'username', tr.username,
-                            'content', tr.tweet_content,
-                            'link', tr.tweet_link,
-                            'metrics', JSON_OBJECT(
-                                'replies', tr.reply_count,
-                                'reposts', tr.repost_count,
-                                'likes', tr.like_count
-                            )
-                        )
-                    ) as results
+                SELECT ts.search_id, ts.search_date, ts.search_time,
+                       tr.username, tr.tweet_content, tr.tweet_link,
+                       tr.reply_count, tr.repost_count, tr.like_count
                 FROM twitter_searches ts
                 LEFT JOIN twitter_results tr ON ts.search_id = tr.search_id
-                WHERE ts.search_query = %s
-                GROUP BY ts.search_id, ts.search_date, ts.search_time
-                ORDER BY ts.search_date DESC, ts.search_time DESC
+                WHERE ts.query_hash = %s
+                ORDER BY ts.search_date DESC, ts.search_time DESC, ts.search_id DESC,
+                         tr.observed_search_id DESC, tr.result_position
             """
             
-        cursor.execute(instances_query, (search_query,))
-        instances = cursor.fetchall()
+        cursor.execute(instances_query, (query_hash,))
         
-        formatted_instances = []
-        for instance in instances:
-            # Convertim data în format românesc (ZZ-LL-AAAA)
-            date_obj = instance[1]
-            formatted_date = date_obj.strftime('%d-%m-%Y')
-            
-            formatted_instances.append({
-                'search_id': instance[0],
-                'date': formatted_date,
-                'time': instance[2].strftime('%H:%M:%S') if hasattr(instance[2], 'strftime') else str(instance[2]),
-                'results': json.loads(instance[3]) if instance[3] else []
-            })
+        instances = {}
+        for row in cursor.fetchall():
+            search_id, date_obj, time_obj = row[:3]
+            if search_id not in instances:
+                # Convertim data în format românesc (ZZ-LL-AAAA)
+                instances[search_id] = {
+                    'search_id': search_id,
+                    'date': date_obj.strftime('%d-%m-%Y'),
+                    'time': time_obj.strftime('%H:%M:%S') if hasattr(time_obj, 'strftime') else str(time_obj),
+                    'results': []
+                }
+            if row[3] is None:
+                continue
+            if source == 'google':
+                instances[search_id]['results'].append({
+                    'link': row[3],
+                    'title': row[4],
+                    'content': row[5]
+                })
+            else:
+                instances[search_id]['results'].append({
+                    'username': row[3],
+                    'content': row[4],
+                    'link': row[5],
+                    'metrics': {
+                        'replies': row[6],
+                        'reposts': row[7],
+                        'likes': row[8]
+                    }
+                })
+        formatted_instances = list(instances.values())
             
         return jsonify({
             'query': search_query,
@@ -1550,16 +4009,17 @@ def get_search_comparison(source, search_id):
                 FROM google_searches gs
                 JOIN google_results gr ON gs.search_id = gr.search_id
                 WHERE gs.search_id = %s
+                ORDER BY gr.result_position
             """
             
             # Get the previous search for the same query
             prev_search_query = """
                 SELECT gs2.search_id
                 FROM google_searches gs1
-                JOIN google_searches gs2 ON gs1.search_query = gs2.search_query
+                JOIN google_searches gs2 ON gs1.query_hash = gs2.query_hash
                 WHERE gs1.search_id = %s
                 AND gs2.search_id < gs1.search_id
-                ORDER BY gs2.search_date DESC, gs2.search_time DESC
+                ORDER BY gs2.search_id DESC
                 LIMIT 1
             """
         else:
@@ -1569,15 +4029,16 @@ def get_search_comparison(source, search_id):
                 FROM twitter_searches ts
                 JOIN twitter_results tr ON ts.search_id = tr.search_id
                 WHERE ts.search_id = %s
+                ORDER BY tr.observed_search_id DESC, tr.result_position
             """
             
             prev_search_query = """
                 SELECT ts2.search_id
                 FROM twitter_searches ts1
-                JOIN twitter_searches ts2 ON ts1.search_query = ts2.search_query
+                JOIN twitter_searches ts2 ON ts1.query_hash = ts2.query_hash
                 WHERE ts1.search_id = %s
                 AND ts2.search_id < ts1.search_id
-                ORDER BY ts2.search_date DESC, ts2.search_time DESC
+                ORDER BY ts2.search_id DESC
                 LIMIT 1
             """
 
@@ -1754,6 +4215,23 @@ def has_changes(prev_result, curr_result, source):
             
     return changes if changes else None
 
+@app.route('/compare_searches/<source>/<int:original_search_id>/<int:new_search_id>')
+def compare_searches(source, original_search_id, new_search_id):
+    """Comparație calculată la cerere între două căutări oarecare (istoricul păstrează doar lanțul)"""
+    if source not in ('google', 'twitter'):
+        return jsonify({'error': 'Unknown source'}), 400
+    connection = DatabaseConnectionManager().get_connection()
+    cursor = connection.cursor(buffered=True)
+    try:
+        if source == 'google':
+            changes = compare_google_search_results_with_cursor(cursor, original_search_id, new_search_id)
+        else:
+            changes = compare_twitter_search_results_with_cursor(cursor, original_search_id, new_search_id)
+        return jsonify(changes)
+    finally:
+        cursor.close()
+        connection.close()
+
 @app.route('/compare_instances', methods=['POST'])
 def compare_instances():
     connection = None
@@ -1787,7 +4265,7 @@ def compare_instances():
                 FROM google_searches gb
                 JOIN google_results gr ON gb.search_id = gr.search_id
                 WHERE gb.search_id IN (%s)
-                ORDER BY gb.search_date, gb.search_time
+                ORDER BY gb.search_date, gb.search_time, gb.search_id, gr.result_position
             """ % id_list
         else:
             results_query = """
@@ -1804,7 +4282,7 @@ def compare_instances():
                 FROM twitter_searches tb
                 JOIN twitter_results tr ON tb.search_id = tr.search_id
                 WHERE tb.search_id IN (%s)
-                ORDER BY tb.search_date, tb.search_time
+                ORDER BY tb.search_date, tb.search_time, tb.search_id, tr.observed_search_id DESC, tr.result_position
             """ % id_list
 
         # Execute query and fetch results
@@ -2202,6 +4680,7 @@ def schedule_search():
         interval_value = int(request.form.get('intervalValue'))
         start_time = datetime.fromisoformat(request.form.get('startTime'))
         end_time = request.form.get('endTime')
+        deep = request.form.get('deep') == 'true'
         
         if end_time:
             end_time = datetime.fromisoformat(end_time)
@@ -2250,25 +4729,17 @@ def schedule_search():
                 if source == 'google':
                     results = perform_google_search(query)
                     if results:
-                        results_with_info = []
-                        for result in results:
-                            try:
-                                title, description, _ = extrage_info_pagina(result)
-                                results_with_info.append({
-                                    'link': result.url if hasattr(result, 'url') else str(result),
-                                    'title': title,
-                                    'description': description
-                                })
-                            except Exception as e:
-                                logger.error(f"Error processing result: {str(e)}")
-                                continue
+                        results_with_info = imbogateste_rezultate(results, deep=deep)
                         
                         if results_with_info:
                             save_google_results(query, results_with_info)
                 else:
-                    results = scrape_twitter(query)
+                    # Trece prin executorul comun, ca job-urile programate să respecte
+                    # concurența și limitele de rată ale conturilor; se caută doar după ultima rulare
+                    since = marcaj_twitter(query)
+                    results = twitter_executor.submit(query, since=since).result()
                     if results:
-                        save_twitter_results(query, results)
+                        save_twitter_results(query, results, since_search_id=since and since['search_id'])
                 
                 # Update the scheduled search record
                 connection = None
@@ -2489,10 +4960,1004 @@ def format_interval(interval_type, interval_value):
     else:  # months
         return f'Every {interval_value} month{"s" if interval_value != 1 else ""}'
 
+class HttpFixtureHarness:
+    """
+    Înregistrare/redare a răspunsurilor HTTP pentru benchmark-uri reproductibile offline.
+    Interceptează requests.Session.send, deci acoperă atât googlesearch cât și HttpFetchClient.
+    - record: salvează fiecare răspuns (pagini de căutare, HTML, PDF) într-o arhivă .json.gz
+    - replay: servește răspunsurile din arhivă, cu latență configurabilă și injectare de erori
+    """
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.replayed = 0
+        self.missing = 0
+        self.injected_errors = 0
+        self._lock = threading.Lock()
+        self._original_send = None
+
+    @staticmethod
+    def _key(prepared_request):
+        return f"{prepared_request.method} {prepared_request.url}"
+
+    def load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            self.entries = {entry['key']: entry for entry in json.load(f)}
+        logger.info(f"Loaded {len(self.entries)} HTTP fixtures from {self.path}")
+
+    def save(self):
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            json.dump(list(self.entries.values()), f)
+        logger.info(f"Saved {len(self.entries)} HTTP fixtures to {self.path}")
+
+    def _install(self, send):
+        self._original_send = requests.Session.send
+        requests.Session.send = send
+
+    def _uninstall(self):
+        requests.Session.send = self._original_send
+
+    def record(self):
+        """Context manager: rulează cererile live și le înregistrează în arhivă"""
+        harness = self
+        original_send = requests.Session.send
+
+        def recording_send(session, prepared_request, **kwargs):
+            kwargs['stream'] = False
+            response = original_send(session, prepared_request, **kwargs)
+            with harness._lock:
+                harness.entries[harness._key(prepared_request)] = {
+                    'key': harness._key(prepared_request),
+                    'url': response.url,
+                    'status': response.status_code,
+                    'headers': dict(response.headers),
+                    'body': base64.b64encode(response.content).decode('ascii')
+                }
+            return response
+
+        return _HarnessContext(self, recording_send, on_exit=self.save)
+
+    def replay(self, latency=0.0, error_rate=0.0, seed=None):
+        """Context manager: servește cererile din arhivă, fără acces la rețea"""
+        harness = self
+        rng = random.Random(seed)
+        self.load()
+
+        def replaying_send(session, prepared_request, **kwargs):
+            if latency:
+                time.sleep(latency)
+            with harness._lock:
+                inject_error = rng.random() < error_rate
+                entry = harness.entries.get(harness._key(prepared_request))
+                if inject_error:
+                    harness.injected_errors += 1
+                elif entry is None:
+                    harness.missing += 1
+                else:
+                    harness.replayed += 1
+            if inject_error:
+                raise requests.ConnectionError(f"Injected error for {prepared_request.url}")
+
+            response = requests.Response()
+            response.request = prepared_request
+            response.url = prepared_request.url
+            if entry is None:
+                response.status_code = 404
+                response._content = b''
+                return response
+            response.status_code = entry['status']
+            response.headers = requests.structures.CaseInsensitiveDict(entry['headers'])
+            # Corpul este deja decomprimat; evităm o a doua decomprimare
+            response.headers.pop('Content-Encoding', None)
+            response._content = base64.b64decode(entry['body'])
+            response._content_consumed = True
+            response.raw = io.BytesIO(response._content)
+            response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+            return response
+
+        return _HarnessContext(self, replaying_send)
+
+class _HarnessContext:
+    def __init__(self, harness, send, on_exit=None):
+        self.harness = harness
+        self.send = send
+        self.on_exit = on_exit
+
+    def __enter__(self):
+        self.harness._install(self.send)
+        return self.harness
+
+    def __exit__(self, *exc_info):
+        self.harness._uninstall()
+        if self.on_exit:
+            self.on_exit()
+        return False
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+def _format_timings(name, values):
+    return (f"{name:<10} mean={statistics.mean(values) * 1000:8.1f}ms "
+            f"p50={_percentile(values, 50) * 1000:8.1f}ms p95={_percentile(values, 95) * 1000:8.1f}ms")
+
+@app.cli.command('record-fixtures')
+@click.argument('archive')
+@click.option('--query', 'queries', multiple=True, required=True, help='Query de înregistrat (repetabil)')
+@click.option('--deep/--no-deep', default=True, help='Înregistrează și paginile rezultatelor')
+def record_fixtures(archive, queries, deep):
+    """Rulează căutările live și înregistrează răspunsurile HTTP în ARCHIVE (.json.gz)"""
+    harness = HttpFixtureHarness(archive)
+    url_cache.enabled = False
+    with harness.record():
+        for query in queries:
+            results = perform_google_search(query, use_cache=False)
+            imbogateste_rezultate(results, deep=deep)
+            click.echo(f"Recorded {query!r}: {len(results)} results")
+
+@app.cli.command('bench-search')
+@click.argument('archive')
+@click.option('--query', 'queries', multiple=True, required=True, help='Query din arhivă (repetabil)')
+@click.option('--iterations', default=5, show_default=True)
+@click.option('--latency', default=0.0, show_default=True, help='Latență simulată per cerere (secunde)')
+@click.option('--error-rate', default=0.0, show_default=True, help='Probabilitatea unei erori injectate')
+@click.option('--deep/--no-deep', default=True)
+@click.option('--seed', default=0, show_default=True)
+def bench_search(archive, queries, iterations, latency, error_rate, deep, seed):
+    """Benchmark offline perform_google_search + extrage_info_pagina din arhiva ARCHIVE"""
+    harness = HttpFixtureHarness(archive)
+    timings = {'search': [], 'enrich': [], 'total': []}
+    url_cache.enabled = False
+    rate_limiter.enabled = False
+    try:
+        with harness.replay(latency=latency, error_rate=error_rate, seed=seed):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                for query in queries:
+                    t0 = time.perf_counter()
+                    try:
+                        results = perform_google_search(query, max_retries=1, use_cache=False)
+                    except Exception as e:
+                        click.echo(f"Search failed for {query!r}: {e}")
+                        results = []
+                    t1 = time.perf_counter()
+                    imbogateste_rezultate(results, deep=deep)
+                    t2 = time.perf_counter()
+                    timings['search'].append(t1 - t0)
+                    timings['enrich'].append(t2 - t1)
+                    timings['total'].append(t2 - t0)
+            elapsed = time.perf_counter() - started
+    finally:
+        url_cache.enabled = True
+        rate_limiter.enabled = True
+
+    searches = len(timings['total'])
+    click.echo(f"{searches} searches in {elapsed:.2f}s = {searches / elapsed:.2f} searches/sec")
+    for stage, values in timings.items():
+        click.echo(_format_timings(stage, values))
+    click.echo(f"replayed={harness.replayed} missing={harness.missing} injected_errors={harness.injected_errors}")
+
+def _rss_arbore_procese(pid):
+    """RSS total (MB) al procesului pid și al descendenților lui, citit din /proc (doar Linux)"""
+    if not os.path.isdir('/proc'):
+        return None
+    parents = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                parents[int(entry)] = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    tree = {pid}
+    changed = True
+    while changed:
+        changed = False
+        for child, parent in parents.items():
+            if parent in tree and child not in tree:
+                tree.add(child)
+                changed = True
+    total_kb = 0
+    for member in tree:
+        try:
+            with open(f'/proc/{member}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total_kb += int(line.split()[1])
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+_BYTES_TRANSFERRED_SCRIPT = """
+const entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+return entries.reduce((total, e) => total + (e.transferSize || 0), 0);
+"""
+
+@app.cli.command('bench-browser')
+@click.option('--url', 'urls', multiple=True, default=['https://twitter.com/explore'], show_default=True,
+              help='Pagina încărcată la fiecare rulare (repetabil)')
+@click.option('--runs', default=3, show_default=True)
+@click.option('--profile', 'profiles', multiple=True, default=['full', 'lean'], show_default=True)
+def bench_browser(urls, runs, profiles):
+    """Compară profilurile Chrome: timp până la pagina gata, bytes transferați și RSS"""
+    for profile in profiles:
+        timings = []
+        transferred = []
+        rss = []
+        driver = webdriver.Chrome(options=creeaza_optiuni_chrome(profile))
+        pooled = PooledDriver(driver, profile)
+        try:
+            for _ in range(runs):
+                for url in urls:
+                    # Tab nou la fiecare rulare, ca în pool: profilul se aplică per tab
+                    pooled.open_tab()
+                    t0 = time.perf_counter()
+                    driver.get(url)
+                    try:
+                        waiter.until(driver, f'bench_{profile}', dom_stabil())
+                    except TimeoutException:
+                        click.echo(f"[{profile}] DOM did not settle for {url}")
+                    timings.append(time.perf_counter() - t0)
+                    transferred.append(driver.execute_script(_BYTES_TRANSFERRED_SCRIPT) or 0)
+                    memory = _rss_arbore_procese(driver.service.process.pid)
+                    if memory is not None:
+                        rss.append(memory)
+                    pooled.close_tab()
+        finally:
+            driver.quit()
+
+        click.echo(f"Profile {profile!r}:")
+        click.echo(_format_timings('page_ready', timings))
+        click.echo(f"  bytes transferred: avg={statistics.mean(transferred) / 1024:.1f} KB "
+                   f"max={max(transferred) / 1024:.1f} KB")
+        if rss:
+            click.echo(f"  rss: avg={statistics.mean(rss):.1f} MB max={max(rss):.1f} MB")
+        else:
+            click.echo("  rss: unavailable on this platform")
+
+_SNAPSHOT_SCRIPT = """
+    var baseUrl = arguments[0];
+    var clone = document.documentElement.cloneNode(true);
+    // Fără scripturi: snapshot-ul trebuie să rămână static când este redeschis offline
+    clone.querySelectorAll('script, noscript, link[rel="preload"], link[rel="modulepreload"], iframe')
+        .forEach(function(element) { element.remove(); });
+    var base = document.createElement('base');
+    base.setAttribute('href', baseUrl);
+    clone.querySelector('head').prepend(base);
+    return '<!DOCTYPE html>' + clone.outerHTML;
+"""
+
+@contextmanager
+def numara_comenzi_driver(driver):
+    """Numără comenzile WebDriver (round trip-uri către chromedriver) trimise în interiorul blocului"""
+    counter = {'commands': 0}
+    original_execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        counter['commands'] += 1
+        return original_execute(driver_command, params)
+
+    # WebElement trimite comenzile tot prin driver.execute, deci sunt numărate și ele
+    driver.execute = counting_execute
+    try:
+        yield counter
+    finally:
+        del driver.execute
+
+class _FixtureRequestHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+@contextmanager
+def server_fixture_uri(directory, file_urls=False):
+    """URL-ul de bază al snapshot-urilor: server HTTP local pe un port liber sau file://"""
+    if file_urls:
+        yield pathlib.Path(directory).resolve().as_uri() + '/'
+        return
+    server = http.server.ThreadingHTTPServer(
+        ('127.0.0.1', 0), functools.partial(_FixtureRequestHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, name='twitter-fixtures', daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+@app.cli.command('record-twitter-fixtures')
+@click.argument('directory')
+@click.option('--query', 'queries', multiple=True, required=True, help='Query Twitter (repetabil)')
+def record_twitter_fixtures(directory, queries):
+    """Salvează în DIRECTORY snapshot-uri HTML statice ale paginilor de rezultate Twitter (necesită cont)"""
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, TWITTER_FIXTURE_MANIFEST)
+    manifest = []
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    with twitter_accounts.acquire() as account, browser_pool.borrow() as pooled:
+        driver = pooled.driver
+        for query in queries:
+            url = _deschide_cautare_twitter(pooled, query, account)
+            try:
+                selector, _ = waiter.until(driver, 'search_results', oricare_selector(TWEET_SELECTORS))
+                waiter.until(driver, 'search_dom_stable', dom_stabil())
+            except TimeoutException:
+                click.echo(f"No tweets rendered for {query!r}, skipping")
+                continue
+            tweets = extrage_tweeturi_batch(driver, selector, url, limit=1000)
+            filename = f"{re.sub(r'[^A-Za-z0-9]+', '_', query).strip('_') or 'query'}_{int(time.time())}.html"
+            with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+                f.write(driver.execute_script(_SNAPSHOT_SCRIPT, TWITTER_FIXTURE_BASE_URL))
+            manifest.append({'file': filename, 'query': query, 'selector': selector, 'tweets': len(tweets)})
+            click.echo(f"Recorded {query!r}: {len(tweets)} tweets -> {filename}")
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+@app.cli.command('bench-twitter')
+@click.argument('directory')
+@click.option('--iterations', default=5, show_default=True)
+@click.option('--mode', 'modes', multiple=True, default=['batch', 'elements'], show_default=True,
+              help='Modul de extragere comparat (repetabil)')
+@click.option('--limit', default=TWITTER_MAX_TWEETS, show_default=True, help='Tweet-uri extrase per pagină')
+@click.option('--file-urls', is_flag=True, help='Deschide snapshot-urile prin file:// în loc de serverul HTTP local')
+def bench_twitter(directory, iterations, modes, limit, file_urls):
+    """
+    Benchmark offline al extragerii Twitter pe snapshot-urile din DIRECTORY:
+    rulează codul real de extragere în Chrome headless și raportează tweets/sec,
+    round trip-urile WebDriver per pagină și timpul total. Iese cu cod 1 dacă numărul
+    de tweet-uri extrase diferă de cel din manifest.
+    """
+    with open(os.path.join(directory, TWITTER_FIXTURE_MANIFEST), encoding='utf-8') as f:
+        fixtures = json.load(f)
+    driver = webdriver.Chrome(options=creeaza_optiuni_chrome())
+    aplica_profil_browser(driver)
+    mismatches = 0
+    try:
+        with server_fixture_uri(directory, file_urls) as base_url:
+            for mode in modes:
+                timings = []
+                round_trips = []
+                tweets = 0
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    for fixture in fixtures:
+                        url = base_url + urllib.parse.quote(fixture['file'])
+                        driver.get(url)
+                        with numara_comenzi_driver(driver) as counter:
+                            t0 = time.perf_counter()
+                            try:
+                                selector, found = waiter.until(driver, 'fixture_results', oricare_selector(TWEET_SELECTORS))
+                            except TimeoutException:
+                                selector, found = None, []
+                            if not selector:
+                                results = []
+                            elif mode == 'batch':
+                                results = extrage_tweeturi_batch(driver, selector, url, limit)
+                            else:
+                                results = extrage_tweeturi_elemente(found, url, limit)
+                            timings.append(time.perf_counter() - t0)
+                        round_trips.append(counter['commands'])
+                        tweets += len(results)
+                        expected = min(fixture['tweets'], limit)
+                        if len(results) != expected:
+                            mismatches += 1
+                            click.echo(f"[{mode}] {fixture['file']}: extracted {len(results)} tweets, expected {expected}")
+                elapsed = time.perf_counter() - started
+                extraction = sum(timings)
+
+                click.echo(f"Mode {mode!r}: {tweets} tweets in {extraction:.2f}s = "
+                           f"{tweets / extraction if extraction else 0:.1f} tweets/sec (wall {elapsed:.2f}s)")
+                click.echo(_format_timings('extract', timings))
+                click.echo(f"  driver round trips per page: avg={statistics.mean(round_trips):.1f} max={max(round_trips)}")
+    finally:
+        driver.quit()
+    if mismatches:
+        raise click.ClickException(f"{mismatches} fixture extractions did not match the manifest")
+
+def _rezultate_sintetice(source, count):
+    """Rezultate artificiale, de dimensiuni realiste, pentru benchmark-ul de scriere"""
+    if source == 'google':
+        return [{
+            'link': f"https://example{i % 50}.com/article/{i}",
+            'title': f"Synthetic result {i}",
+            'description': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 4
+        } for i in range(count)]
+    now = datetime.now()
+    return [{
+        'username': f"@user{i % 100}",
+        'content': f"Synthetic tweet {i} " + 'lorem ipsum ' * 20,
+        'link': f"https://x.com/user{i % 100}/status/{10 ** 15 + i}",
+        'metrics': {'replies': i % 7, 'reposts': i % 11, 'likes': i % 13},
+        'date': now.date(),
+        'time': now.time()
+    } for i in range(count)]
+
+@app.cli.command('bench-db-insert')
+@click.option('--rows', 'sizes', multiple=True, type=int, default=[10, 100, 1000], show_default=True)
+@click.option('--iterations', default=3, show_default=True)
+@click.option('--batch-size', default=DB_INSERT_BATCH_SIZE, show_default=True)
+def bench_db_insert(sizes, iterations, batch_size):
+    """
+    Compară inserarea rând cu rând cu inserarea în loturi multi-row (rânduri/secundă).
+    Rulează pe baza de date configurată, în tranzacții anulate la final (nu rămân date).
+    """
+    connection = DatabaseConnectionManager().get_connection()
+    cursor = connection.cursor(buffered=True)
+    try:
+        for source in ('google', 'twitter'):
+            for size in sizes:
+                results = _rezultate_sintetice(source, size)
+                line = [f"{source:<8} {size:>6} rows:"]
+                for label, mode_batch_size in (('loop', 1), ('bulk', batch_size)):
+                    durations = []
+                    for _ in range(iterations):
+                        connection.start_transaction()
+                        try:
+                            if source == 'google':
+                                search_id, _, _ = insereaza_cautare_google(cursor, 'bench-db-insert')
+                                t0 = time.perf_counter()
+                                insereaza_rezultate_google(cursor, search_id, results, mode_batch_size)
+                            else:
+                                search_id, current_date, current_time = insereaza_cautare_twitter(cursor, 'bench-db-insert')
+                                t0 = time.perf_counter()
+                                insereaza_rezultate_twitter(cursor, search_id, results, current_date,
+                                                            current_time, mode_batch_size)
+                            durations.append(time.perf_counter() - t0)
+                        finally:
+                            connection.rollback()
+                    line.append(f"{label}={size / statistics.mean(durations):10.0f} rows/sec")
+                click.echo('  '.join(line))
+    finally:
+        cursor.close()
+        connection.close()
+
+@app.cli.command('compact-history')
+@click.option('--dry-run', is_flag=True, help='Doar raportează rândurile care ar fi șterse')
+@click.option('--optimize/--no-optimize', default=True, help='Rulează OPTIMIZE TABLE după ștergere')
+@click.option('--batch-size', default=1000, show_default=True)
+def compact_history(dry_run, optimize, batch_size):
+    """
+    Migrează tabelele *_search_history la istoricul în lanț: păstrează doar rândul
+    (căutare anterioară → căutare) pentru fiecare căutare și șterge comparațiile cu
+    căutările mai vechi, înregistrate de versiunile anterioare.
+    """
+    connection = DatabaseConnectionManager().get_connection()
+    cursor = connection.cursor(buffered=True)
+    try:
+        for source in ('google', 'twitter'):
+            # Predecesorul fiecărei căutări: căutarea anterioară cu același query
+            cursor.execute(f"""
+                SELECT search_id, query_hash FROM {source}_searches
+                ORDER BY query_hash, search_id
+            """)
+            predecessor = {}
+            previous_query = previous_id = None
+            for search_id, query_hash in cursor.fetchall():
+                if query_hash == previous_query:
+                    predecessor[search_id] = previous_id
+                previous_query, previous_id = query_hash, search_id
+
+            cursor.execute(f"""
+                SELECT history_id, original_search_id, related_search_id
+                FROM {source}_search_history
+                ORDER BY history_id
+            """)
+            rows = cursor.fetchall()
+            kept = set()
+            obsolete = []
+            for history_id, original_id, related_id in rows:
+                pair = (original_id, related_id)
+                if predecessor.get(related_id) == original_id and pair not in kept:
+                    kept.add(pair)
+                else:
+                    obsolete.append(history_id)
+
+            click.echo(f"{source}: {len(rows)} history rows, {len(kept)} chain links, {len(obsolete)} obsolete")
+            if dry_run or not obsolete:
+                continue
+            for start in range(0, len(obsolete), batch_size):
+                chunk = obsolete[start:start + batch_size]
+                cursor.execute(
+                    f"DELETE FROM {source}_search_history WHERE history_id IN ({','.join(['%s'] * len(chunk))})",
+                    chunk
+                )
+                connection.commit()
+            click.echo(f"{source}: deleted {len(obsolete)} rows")
+            if optimize:
+                cursor.execute(f"OPTIMIZE TABLE {source}_search_history")
+                cursor.fetchall()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+        connection.close()
+
+CANONICAL_STORAGE_DDL = {
+    'google': [
+        """
+        CREATE TABLE IF NOT EXISTS pages (
+            page_id INT AUTO_INCREMENT PRIMARY KEY,
+            url_hash CHAR(40) NOT NULL,
+            url VARCHAR(512) NOT NULL,
+            site_name VARCHAR(255),
+            UNIQUE KEY uq_url_hash (url_hash),
+            INDEX idx_site_name (site_name)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS page_versions (
+            version_hash CHAR(40) PRIMARY KEY,
+            page_id INT NOT NULL,
+            result_title TEXT,
+            result_content TEXT,
+            first_seen DATETIME NOT NULL,
+            FOREIGN KEY (page_id) REFERENCES pages(page_id),
+            INDEX idx_page_id (page_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS page_observations (
+            observation_id INT AUTO_INCREMENT PRIMARY KEY,
+            search_id INT NOT NULL,
+            page_id INT NOT NULL,
+            result_position INT NOT NULL,
+            version_hash CHAR(40) NOT NULL,
+            FOREIGN KEY (search_id) REFERENCES google_searches(search_id),
+            FOREIGN KEY (page_id) REFERENCES pages(page_id),
+            FOREIGN KEY (version_hash) REFERENCES page_versions(version_hash),
+            INDEX idx_search_page (search_id, page_id)
+        )
+        """
+    ],
+    'twitter': [
+        """
+        CREATE TABLE IF NOT EXISTS tweets (
+            tweet_id INT AUTO_INCREMENT PRIMARY KEY,
+            link_hash CHAR(40) NOT NULL,
+            tweet_link VARCHAR(512) NOT NULL,
+            username VARCHAR(255) NOT NULL,
+            tweet_date DATE,
+            tweet_time TIME,
+            UNIQUE KEY uq_link_hash (link_hash),
+            INDEX idx_username (username)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS tweet_versions (
+            version_hash CHAR(40) PRIMARY KEY,
+            tweet_id INT NOT NULL,
+            tweet_content TEXT NOT NULL,
+            first_seen DATETIME NOT NULL,
+            FOREIGN KEY (tweet_id) REFERENCES tweets(tweet_id),
+            INDEX idx_tweet_id (tweet_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS tweet_observations (
+            observation_id INT AUTO_INCREMENT PRIMARY KEY,
+            search_id INT NOT NULL,
+            tweet_id INT NOT NULL,
+            result_position INT NOT NULL,
+            version_hash CHAR(40) NOT NULL,
+            reply_count INT DEFAULT 0,
+            repost_count INT DEFAULT 0,
+            like_count INT DEFAULT 0,
+            bookmark_count INT DEFAULT 0,
+            FOREIGN KEY (search_id) REFERENCES twitter_searches(search_id),
+            FOREIGN KEY (tweet_id) REFERENCES tweets(tweet_id),
+            FOREIGN KEY (version_hash) REFERENCES tweet_versions(version_hash),
+            INDEX idx_search_tweet (search_id, tweet_id)
+        )
+        """
+    ]
+}
+
+# Vederi cu forma vechilor tabele google_results / twitter_results, folosite de toate citirile.
+# Vederile nu au ordine proprie: cititorii sortează după result_position (Google) și
+# după observed_search_id DESC, result_position (Twitter - tweet-urile cele mai noi primele)
+CANONICAL_RESULT_VIEWS = {
+    'google': """
+        CREATE VIEW google_results AS
+        SELECT o.observation_id AS result_id, o.search_id, o.result_position, p.site_name, p.url AS result_link,
+               v.result_title, v.result_content, NULL AS publish_date, NULL AS publish_time
+        FROM page_observations o
+        JOIN pages p ON p.page_id = o.page_id
+        JOIN page_versions v ON v.version_hash = o.version_hash
+    """,
+    # O căutare Twitter incrementală include și tweet-urile căutărilor anterioare din lanțul ei;
+    # observed_search_id este căutarea care a observat (și a măsurat) efectiv tweet-ul
+    'twitter': """
+        CREATE VIEW twitter_results AS
+        SELECT o.observation_id AS result_id, s.search_id, o.search_id AS observed_search_id, o.result_position,
+               t.username, v.tweet_content, t.tweet_link,
+               t.tweet_date, t.tweet_time, o.reply_count, o.repost_count, o.like_count, o.bookmark_count
+        FROM twitter_searches s
+        JOIN twitter_searches m ON m.chain_root_id = s.chain_root_id AND m.search_id <= s.search_id
+        JOIN tweet_observations o ON o.search_id = m.search_id
+        JOIN tweets t ON t.tweet_id = o.tweet_id
+        JOIN tweet_versions v ON v.version_hash = o.version_hash
+    """
+}
+
+def asigura_lant_twitter(cursor):
+    """
+    Adaugă în twitter_searches coloanele lanțului incremental (since_search_id, chain_root_id)
+    și indexul lor, dacă lipsesc; căutările existente devin rădăcina propriului lanț.
+    """
+    cursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'twitter_searches'
+        AND COLUMN_NAME IN ('since_search_id', 'chain_root_id')
+    """)
+    existing = {row[0] for row in cursor.fetchall()}
+    if 'since_search_id' not in existing:
+        cursor.execute("ALTER TABLE twitter_searches ADD COLUMN since_search_id INT NULL AFTER query_hash")
+    if 'chain_root_id' not in existing:
+        cursor.execute("ALTER TABLE twitter_searches ADD COLUMN chain_root_id INT NULL AFTER since_search_id, "
+                       "ADD INDEX idx_chain_root (chain_root_id, search_id)")
+    cursor.execute("UPDATE twitter_searches SET chain_root_id = search_id WHERE chain_root_id IS NULL")
+    return cursor.rowcount
+
+@app.cli.command('refresh-result-views')
+def refresh_result_views():
+    """Recreează vederile google_results / twitter_results după o schimbare a definiției lor"""
+    connection = DatabaseConnectionManager().get_connection()
+    cursor = connection.cursor(buffered=True)
+    try:
+        for source in ('google', 'twitter'):
+            view = f"{source}_results"
+            cursor.execute("""
+                SELECT TABLE_TYPE FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+            """, (view,))
+            table_type = cursor.fetchone()
+            if not table_type or table_type[0] != 'VIEW':
+                click.echo(f"{view} is not a view yet, run migrate-canonical-storage first")
+                continue
+            if source == 'twitter':
+                asigura_lant_twitter(cursor)
+                connection.commit()
+            cursor.execute(f"DROP VIEW {view}")
+            cursor.execute(CANONICAL_RESULT_VIEWS[source])
+            click.echo(f"{view} recreated")
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+        connection.close()
+
+@app.cli.command('migrate-twitter-chains')
+def migrate_twitter_chains():
+    """
+    Pregătește o bază de date existentă pentru căutările Twitter incrementale fără copierea tweet-urilor:
+    adaugă coloanele lanțului în twitter_searches și recreează vederea twitter_results.
+    """
+    connection = DatabaseConnectionManager().get_connection()
+    cursor = connection.cursor(buffered=True)
+    try:
+        cursor.execute("""
+            SELECT TABLE_TYPE FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'twitter_results'
+        """)
+        table_type = cursor.fetchone()
+        if not table_type or table_type[0] != 'VIEW':
+            raise click.ClickException("twitter_results is not a view yet, run migrate-canonical-storage first")
+        roots = asigura_lant_twitter(cursor)
+        connection.commit()
+        cursor.execute("DROP VIEW twitter_results")
+        cursor.execute(CANONICAL_RESULT_VIEWS['twitter'])
+        click.echo(f"twitter_searches: {roots} searches marked as chain roots, twitter_results view recreated")
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+        connection.close()
+
+@app.cli.command('migrate-canonical-storage')
+@click.option('--batch-size', default=200, show_default=True, help='Căutări migrate per tranzacție')
+def migrate_canonical_storage(batch_size):
+    """
+    Mută rezultatele din vechile tabele google_results / twitter_results în stocarea canonică
+    (pages/tweets, versiuni de conținut și observații). Vechile tabele sunt redenumite în
+    *_results_legacy și înlocuite cu vederi compatibile. Poate fi reluată după o întrerupere.
+    """
+    connection = DatabaseConnectionManager().get_connection()
+    cursor = connection.cursor(buffered=True)
+    try:
+        for source in ('google', 'twitter'):
+            table = f"{source}_results"
+            cursor.execute("""
+                SELECT TABLE_TYPE FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+            """, (table,))
+            table_type = cursor.fetchone()
+            if table_type and table_type[0] == 'VIEW':
+                click.echo(f"{table} already uses canonical storage")
+                continue
+            for ddl in CANONICAL_STORAGE_DDL[source]:
+                cursor.execute(ddl)
+
+            observations = 'page_observations' if source == 'google' else 'tweet_observations'
+            cursor.execute(f"SELECT DISTINCT search_id FROM {observations}")
+            migrated = {row[0] for row in cursor.fetchall()}
+            cursor.execute(f"SELECT DISTINCT search_id FROM {table} ORDER BY search_id")
+            pending = [row[0] for row in cursor.fetchall() if row[0] not in migrated]
+            click.echo(f"{source}: {len(migrated)} searches already migrated, {len(pending)} pending")
+
+            for start in range(0, len(pending), batch_size):
+                for search_id in pending[start:start + batch_size]:
+                    if source == 'google':
+                        cursor.execute("""
+                            SELECT result_link, result_title, result_content FROM google_results
+                            WHERE search_id = %s ORDER BY result_id
+                        """, (search_id,))
+                        results = [{'link': link, 'title': title, 'description': content}
+                                   for link, title, content in cursor.fetchall()]
+                        insereaza_rezultate_google(cursor, search_id, results)
+                    else:
+                        cursor.execute("""
+                            SELECT username, tweet_content, tweet_link, tweet_date, tweet_time,
+                                   reply_count, repost_count, like_count, bookmark_count
+                            FROM twitter_results
+                            WHERE search_id = %s ORDER BY result_id
+                        """, (search_id,))
+                        results = [{
+                            'username': username, 'content': content, 'link': link,
+                            'date': tweet_date, 'time': tweet_time,
+                            'metrics': {'replies': replies, 'reposts': reposts, 'likes': likes, 'bookmarks': bookmarks}
+                        } for username, content, link, tweet_date, tweet_time, replies, reposts, likes, bookmarks
+                          in cursor.fetchall()]
+                        insereaza_rezultate_twitter(cursor, search_id, results, None, None)
+                connection.commit()
+                click.echo(f"{source}: migrated {min(start + batch_size, len(pending))}/{len(pending)} searches")
+
+            cursor.execute(f"RENAME TABLE {table} TO {table}_legacy")
+            if source == 'twitter':
+                asigura_lant_twitter(cursor)
+            cursor.execute(CANONICAL_RESULT_VIEWS[source])
+            click.echo(f"{source}: {table} renamed to {table}_legacy and replaced by a view")
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+        connection.close()
+
+COMPARISON_INDEXES = [
+    # (tabel, index nou, coloane, index vechi devenit redundant)
+    ('google_results', 'idx_search_link', 'search_id, result_link', 'idx_search_id'),
+    ('twitter_results', 'idx_search_link', 'search_id, tweet_link', 'idx_search_id'),
+]
+
+@app.cli.command('ensure-indexes')
+def ensure_indexes():
+    """Adaugă indexurile compuse folosite la comparații pe bazele de date create înainte de introducerea lor"""
+    connection = DatabaseConnectionManager().get_connection()
+    cursor = connection.cursor(buffered=True)
+    try:
+        for table, index, columns, redundant in COMPARISON_INDEXES:
+            cursor.execute("""
+                SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+            """, (table,))
+            existing = {row[0] for row in cursor.fetchall()}
+            cursor.execute("""
+                SELECT TABLE_TYPE FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+            """, (table,))
+            table_type = cursor.fetchone()
+            if table_type and table_type[0] == 'VIEW':
+                click.echo(f"{table} is a view over the canonical tables, nothing to do")
+                continue
+            if index not in existing:
+                click.echo(f"Creating {table}.{index} ({columns})")
+                cursor.execute(f"ALTER TABLE {table} ADD INDEX {index} ({columns})")
+            if redundant in existing:
+                # Cheia străină pe search_id folosește de acum prefixul indexului compus
+                click.echo(f"Dropping redundant {table}.{redundant}")
+                cursor.execute(f"ALTER TABLE {table} DROP INDEX {redundant}")
+        click.echo("Indexes are up to date")
+    finally:
+        cursor.close()
+        connection.close()
+
+# Comparațiile anterioare, păstrate doar ca referință pentru bench-compare
+_LEGACY_COMPARE_QUERIES = {
+    'google': """
+        WITH original_results AS (
+            SELECT result_link FROM google_results WHERE search_id = %s
+        ),
+        new_results AS (
+            SELECT result_link FROM google_results WHERE search_id = %s
+        )
+        SELECT
+            (SELECT COUNT(*) FROM new_results
+             WHERE result_link NOT IN (SELECT result_link FROM original_results)) as new_count,
+            (SELECT COUNT(*) FROM original_results
+             WHERE result_link NOT IN (SELECT result_link FROM new_results)) as removed_count
+    """,
+    'twitter': """
+        WITH original_tweets AS (
+            SELECT tweet_link, reply_count, repost_count, like_count
+            FROM twitter_results WHERE search_id = %s
+        ),
+        new_tweets AS (
+            SELECT tweet_link, reply_count, repost_count, like_count
+            FROM twitter_results WHERE search_id = %s
+        )
+        SELECT
+            (SELECT COUNT(*) FROM new_tweets
+             WHERE tweet_link NOT IN (SELECT tweet_link FROM original_tweets)) as new_count,
+            (SELECT COUNT(*) FROM original_tweets
+             WHERE tweet_link NOT IN (SELECT tweet_link FROM new_tweets)) as removed_count,
+            JSON_ARRAYAGG(JSON_OBJECT('tweet_link', nt.tweet_link)) as engagement_changes
+        FROM original_tweets ot
+        JOIN new_tweets nt ON ot.tweet_link = nt.tweet_link
+        WHERE nt.reply_count != ot.reply_count
+           OR nt.repost_count != ot.repost_count
+           OR nt.like_count != ot.like_count
+    """
+}
+
+def _afiseaza_explain(cursor, query, params):
+    cursor.execute('EXPLAIN ' + query, params)
+    columns = cursor.column_names
+    for row in cursor.fetchall():
+        plan = dict(zip(columns, row))
+        click.echo(f"    {plan.get('select_type')!s:<12} table={plan.get('table')!s:<16} "
+                   f"type={plan.get('type')!s:<7} key={plan.get('key')!s:<16} rows={plan.get('rows')!s:<8} "
+                   f"{plan.get('Extra') or ''}")
+
+@app.cli.command('bench-compare')
+@click.option('--searches', default=10000, show_default=True, help='Căutări sintetice pentru același query')
+@click.option('--results', default=10, show_default=True, help='Rezultate per căutare')
+@click.option('--pairs', default=200, show_default=True, help='Perechi consecutive comparate')
+def bench_compare(searches, results, pairs):
+    """
+    Compară vechea comparație NOT IN cu diferența pe mulțimi prin indexul (search_id, link):
+    afișează planurile EXPLAIN și timpul per comparație. Datele sintetice sunt inserate
+    într-o tranzacție anulată la final.
+    """
+    connection = DatabaseConnectionManager().get_connection()
+    cursor = connection.cursor(buffered=True)
+    query = f"bench-compare-{uuid.uuid4().hex}"
+    now = datetime.now()
+    try:
+        connection.start_transaction()
+        for source in ('google', 'twitter'):
+            insereaza_in_loturi(cursor, f"""
+                INSERT INTO {source}_searches (search_query, query_hash, search_date, search_time)
+                VALUES (%s, %s, %s, %s)
+            """, [(query, amprenta_query(query), now.date(), now.time())] * searches)
+            if source == 'twitter':
+                cursor.execute("UPDATE twitter_searches SET chain_root_id = search_id WHERE query_hash = %s",
+                               (amprenta_query(query),))
+            cursor.execute(f"SELECT search_id FROM {source}_searches WHERE query_hash = %s ORDER BY search_id",
+                           (amprenta_query(query),))
+            search_ids = [row[0] for row in cursor.fetchall()]
+
+            # Fiecare căutare păstrează majoritatea link-urilor celei anterioare, ca în monitorizarea reală
+            for i, search_id in enumerate(search_ids):
+                if source == 'google':
+                    insereaza_rezultate_google(cursor, search_id, [
+                        {'link': f"https://example.com/{i + j}", 'title': 't', 'description': 'c'}
+                        for j in range(results)
+                    ])
+                else:
+                    insereaza_rezultate_twitter(cursor, search_id, [
+                        {'username': '@user', 'content': 'c', 'link': f"https://x.com/user/status/{i + j}",
+                         'metrics': {'replies': j, 'reposts': (i + j) % 5, 'likes': i % 7}}
+                        for j in range(results)
+                    ], now.date(), now.time())
+            cursor.execute('ANALYZE TABLE page_observations, pages' if source == 'google'
+                           else 'ANALYZE TABLE tweet_observations, tweets')
+            cursor.fetchall()
+
+            sample = random.Random(0).sample(range(1, len(search_ids)), min(pairs, len(search_ids) - 1))
+            compare = (compare_google_search_results_with_cursor if source == 'google'
+                       else compare_twitter_search_results_with_cursor)
+            current_query = GOOGLE_COMPARE_ROWS_QUERY if source == 'google' else TWITTER_COMPARE_ROWS_QUERY
+            first_pair = (search_ids[sample[0] - 1], search_ids[sample[0]])
+
+            click.echo(f"{source}: {len(search_ids)} searches x {results} results")
+            click.echo("  EXPLAIN legacy NOT IN:")
+            _afiseaza_explain(cursor, _LEGACY_COMPARE_QUERIES[source], first_pair)
+            click.echo("  EXPLAIN indexed lookup:")
+            _afiseaza_explain(cursor, current_query,
+                              first_pair if source == 'google' else first_pair[:1])
+
+            timings = {'legacy': [], 'indexed': []}
+            for index in sample:
+                pair = (search_ids[index - 1], search_ids[index])
+                t0 = time.perf_counter()
+                cursor.execute(_LEGACY_COMPARE_QUERIES[source], pair)
+                cursor.fetchall()
+                t1 = time.perf_counter()
+                compare(cursor, *pair)
+                t2 = time.perf_counter()
+                timings['legacy'].append(t1 - t0)
+                timings['indexed'].append(t2 - t1)
+            for name, values in timings.items():
+                click.echo('  ' + _format_timings(name, values))
+    finally:
+        connection.rollback()
+        cursor.close()
+        connection.close()
+
+@app.cli.command('backfill-query-hash')
+@click.option('--batch-size', default=1000, show_default=True)
+@click.option('--rehash', is_flag=True, help='Recalculează amprenta tuturor rândurilor (după schimbarea normalizării)')
+def backfill_query_hash(batch_size, rehash):
+    """
+    Adaugă coloana query_hash (amprenta query-ului) și indexul ei în tabelele de căutări
+    create înainte de introducerea lor, apoi completează amprenta pentru rândurile existente.
+    """
+    connection = DatabaseConnectionManager().get_connection()
+    cursor = connection.cursor(buffered=True)
+    try:
+        for table in ('google_searches', 'twitter_searches'):
+            cursor.execute("""
+                SELECT COUNT(*) FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = 'query_hash'
+            """, (table,))
+            if not cursor.fetchone()[0]:
+                click.echo(f"Adding {table}.query_hash")
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN query_hash CHAR(40) NULL AFTER search_query")
+
+            filled = 0
+            last_id = 0
+            while True:
+                # Paginare după search_id, ca rândurile deja actualizate să nu fie citite din nou
+                cursor.execute(f"""
+                    SELECT search_id, search_query, query_hash FROM {table}
+                    WHERE search_id > %s {'' if rehash else 'AND query_hash IS NULL'}
+                    ORDER BY search_id
+                    LIMIT %s
+                """, (last_id, batch_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                updates = [(amprenta_query(search_query), search_id)
+                           for search_id, search_query, query_hash in rows
+                           if query_hash != amprenta_query(search_query)]
+                insereaza_in_loturi(cursor, f"UPDATE {table} SET query_hash = %s WHERE search_id = %s", updates, 1)
+                connection.commit()
+                filled += len(updates)
+            click.echo(f"{table}: backfilled {filled} rows")
+
+            cursor.execute("""
+                SELECT COUNT(*) FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = 'idx_query_hash'
+            """, (table,))
+            if not cursor.fetchone()[0]:
+                click.echo(f"Creating {table}.idx_query_hash")
+                cursor.execute(f"ALTER TABLE {table} MODIFY query_hash CHAR(40) NOT NULL, "
+                               f"ADD INDEX idx_query_hash (query_hash, search_id)")
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+        connection.close()
+
 # Add this to ensure scheduler is shut down properly
 @atexit.register
 def shutdown_scheduler():
     scheduler.shutdown()
+    search_jobs.shutdown()
+    twitter_executor.shutdown()
+    browser_pool.close_all()
+    if _pdf_executor is not None:
+        _pdf_executor.shutdown(wait=False)
 
 if __name__ == '__main__':
     """
@@ -2,30 +2,70 @@
 CREATE DATABASE IF NOT EXISTS osint_search;
 USE osint_search;
 
+-- O căutare incrementală salvează doar tweet-urile noi: since_search_id este căutarea continuată,
+-- iar chain_root_id este prima căutare completă din lanț (pentru o căutare completă, ea însăși)
 CREATE TABLE twitter_searches (
     search_id INT AUTO_INCREMENT PRIMARY KEY,
     search_query TEXT NOT NULL,
+    query_hash CHAR(40) NOT NULL,
+    since_search_id INT NULL,
+    chain_root_id INT NULL,
     search_date DATE NOT NULL,
-    search_time TIME NOT NULL
+    search_time TIME NOT NULL,
+    INDEX idx_query_hash (query_hash, search_id),
+    INDEX idx_chain_root (chain_root_id, search_id)
 );
 
-CREATE TABLE twitter_results (
-    result_id INT AUTO_INCREMENT PRIMARY KEY,
-    search_id INT NOT NULL,
-    username VARCHAR(255) NOT NULL,
-    tweet_content TEXT NOT NULL,
+-- Stocare canonică: fiecare tweet și fiecare versiune a textului sunt salvate o singură dată,
+-- iar o căutare înregistrează doar observații (poziție, versiune, metrici)
+CREATE TABLE tweets (
+    tweet_id INT AUTO_INCREMENT PRIMARY KEY,
+    link_hash CHAR(40) NOT NULL,
     tweet_link VARCHAR(512) NOT NULL,
+    username VARCHAR(255) NOT NULL,
     tweet_date DATE,
     tweet_time TIME,
+    UNIQUE KEY uq_link_hash (link_hash),
+    INDEX idx_username (username)
+);
+
+CREATE TABLE tweet_versions (
+    version_hash CHAR(40) PRIMARY KEY,
+    tweet_id INT NOT NULL,
+    tweet_content TEXT NOT NULL,
+    first_seen DATETIME NOT NULL,
+    FOREIGN KEY (tweet_id) REFERENCES tweets(tweet_id),
+    INDEX idx_tweet_id (tweet_id)
+);
+
+CREATE TABLE tweet_observations (
+    observation_id INT AUTO_INCREMENT PRIMARY KEY,
+    search_id INT NOT NULL,
+    tweet_id INT NOT NULL,
+    result_position INT NOT NULL,
+    version_hash CHAR(40) NOT NULL,
     reply_count INT DEFAULT 0,
     repost_count INT DEFAULT 0,
     like_count INT DEFAULT 0,
     bookmark_count INT DEFAULT 0,
     FOREIGN KEY (search_id) REFERENCES twitter_searches(search_id),
-    INDEX idx_search_id (search_id),
-    INDEX idx_username (username)
+    FOREIGN KEY (tweet_id) REFERENCES tweets(tweet_id),
+    FOREIGN KEY (version_hash) REFERENCES tweet_versions(version_hash),
+    INDEX idx_search_tweet (search_id, tweet_id)
 );
 
+-- Vedere cu forma vechiului tabel twitter_results: o căutare include și tweet-urile căutărilor
+-- anterioare din lanțul ei incremental; observed_search_id este căutarea care a observat tweet-ul
+CREATE VIEW twitter_results AS
+SELECT o.observation_id AS result_id, s.search_id, o.search_id AS observed_search_id, o.result_position,
+       t.username, v.tweet_content, t.tweet_link,
+       t.tweet_date, t.tweet_time, o.reply_count, o.repost_count, o.like_count, o.bookmark_count
+FROM twitter_searches s
+JOIN twitter_searches m ON m.chain_root_id = s.chain_root_id AND m.search_id <= s.search_id
+JOIN tweet_observations o ON o.search_id = m.search_id
+JOIN tweets t ON t.tweet_id = o.tweet_id
+JOIN tweet_versions v ON v.version_hash = o.version_hash;
+
 CREATE TABLE twitter_search_history (
     history_id INT AUTO_INCREMENT PRIMARY KEY,
     original_search_id INT NOT NULL,
@@ -45,24 +85,52 @@ CREATE TABLE twitter_search_history (
 CREATE TABLE google_searches (
     search_id INT AUTO_INCREMENT PRIMARY KEY,
     search_query TEXT NOT NULL,
+    query_hash CHAR(40) NOT NULL,
     search_date DATE NOT NULL,
-    search_time TIME NOT NULL
+    search_time TIME NOT NULL,
+    INDEX idx_query_hash (query_hash, search_id)
 );
 
-CREATE TABLE google_results (
-    result_id INT AUTO_INCREMENT PRIMARY KEY,
-    search_id INT NOT NULL,
+-- Stocare canonică: fiecare pagină și fiecare versiune a conținutului sunt salvate o singură dată
+CREATE TABLE pages (
+    page_id INT AUTO_INCREMENT PRIMARY KEY,
+    url_hash CHAR(40) NOT NULL,
+    url VARCHAR(512) NOT NULL,
     site_name VARCHAR(255),
-    result_link VARCHAR(512) NOT NULL,
+    UNIQUE KEY uq_url_hash (url_hash),
+    INDEX idx_site_name (site_name)
+);
+
+CREATE TABLE page_versions (
+    version_hash CHAR(40) PRIMARY KEY,
+    page_id INT NOT NULL,
     result_title TEXT,
     result_content TEXT,
-    publish_date DATE,
-    publish_time TIME,
+    first_seen DATETIME NOT NULL,
+    FOREIGN KEY (page_id) REFERENCES pages(page_id),
+    INDEX idx_page_id (page_id)
+);
+
+CREATE TABLE page_observations (
+    observation_id INT AUTO_INCREMENT PRIMARY KEY,
+    search_id INT NOT NULL,
+    page_id INT NOT NULL,
+    result_position INT NOT NULL,
+    version_hash CHAR(40) NOT NULL,
     FOREIGN KEY (search_id) REFERENCES google_searches(search_id),
-    INDEX idx_search_id (search_id),
-    INDEX idx_site_name (site_name)
+    FOREIGN KEY (page_id) REFERENCES pages(page_id),
+    FOREIGN KEY (version_hash) REFERENCES page_versions(version_hash),
+    INDEX idx_search_page (search_id, page_id)
 );
 
+-- Vedere cu forma vechiului tabel google_results (un rând per observație)
+CREATE VIEW google_results AS
+SELECT o.observation_id AS result_id, o.search_id, o.result_position, p.site_name, p.url AS result_link,
+       v.result_title, v.result_content, NULL AS publish_date, NULL AS publish_time
+FROM page_observations o
+JOIN pages p ON p.page_id = o.page_id
+JOIN page_versions v ON v.version_hash = o.version_hash;
+
 CREATE TABLE google_search_history (
     history_id INT AUTO_INCREMENT PRIMARY KEY,
     original_search_id INT NOT NULL,
@@ -94,6 +162,19 @@ CREATE TABLE scheduled_searches (
     total_runs INT DEFAULT 0
 );
 
+CREATE TABLE url_metadata_cache (
+    url_hash CHAR(40) PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    content_hash CHAR(40),
+    etag VARCHAR(255),
+    last_modified VARCHAR(64),
+    fetched_at DATETIME NOT NULL,
+    last_access DATETIME NOT NULL,
+    INDEX idx_last_access (last_access)
+);
+
 -- Creează utilizatorul MySQL cu permisiunile corespunzătoare
 CREATE USER IF NOT EXISTS 'root'@'localhost' IDENTIFIED BY 'parola_de_conectare_la_baza_de_date';
 GRANT ALL PRIVILEGES ON osint_search.* TO 'root'@'localhost';
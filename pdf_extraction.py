@@ -0,0 +1,33 @@
+"""
+Extragerea textului din PDF-uri, rulată în procesele din pdf_executor.
+Modulul nu are efecte secundare la import: pe Windows procesele sunt pornite prin spawn
+și reimportă doar acest modul, nu app.py (pool MySQL, executori, scheduler).
+"""
+import io
+import time
+
+import PyPDF2
+
+def extrage_text_pdf(source, first_page=0, last_page=None):
+    """
+    Extrage textul dintr-un PDF. Rulează într-un proces separat din pdf_executor (vezi app.py).
+    source poate fi conținutul PDF-ului (bytes) sau calea unui fișier temporar.
+    Returnează textul paginilor [first_page, last_page) și statistici de extragere.
+    """
+    start = time.perf_counter()
+    stream = io.BytesIO(source) if isinstance(source, bytes) else open(source, 'rb')
+    try:
+        pdf_reader = PyPDF2.PdfReader(stream)
+        total_pages = len(pdf_reader.pages)
+        last_page = total_pages if last_page is None else min(last_page, total_pages)
+        parts = []
+        for page_number in range(first_page, last_page):
+            parts.append(pdf_reader.pages[page_number].extract_text() or '')
+        return {
+            'text': ''.join(parts),
+            'pages': len(parts),
+            'total_pages': total_pages,
+            'elapsed': time.perf_counter() - start
+        }
+    finally:
+        stream.close()